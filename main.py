@@ -1,22 +1,28 @@
 """Main entry point for SyncBit."""
 
 import argparse
+import contextlib
 import logging
+import os
 import sys
 
 from src.config import Config
 from src.fitbit_auth import FitbitAuth
-from src.scheduler import SyncScheduler
 
 
 def setup_logging(log_level: str = "INFO") -> None:
     """Setup logging configuration."""
     handlers = [logging.StreamHandler(sys.stdout)]
 
-    # Add file handler if data directory exists
-    if Config.DATA_DIR.exists():
-        log_file = Config.DATA_DIR / "syncbit.log"
-        handlers.append(logging.FileHandler(log_file))
+    # Add file handler if data directory exists and the log file isn't already attached
+    log_file = os.path.abspath(Config.DATA_DIR / "syncbit.log")
+    has_file_handler = any(
+        isinstance(h, logging.FileHandler) and h.baseFilename == log_file
+        for h in logging.getLogger().handlers
+    )
+    if not has_file_handler:
+        with contextlib.suppress(FileNotFoundError):
+            handlers.append(logging.FileHandler(log_file))
 
     logging.basicConfig(
         level=getattr(logging, log_level),
@@ -44,20 +50,23 @@ def authorize() -> None:
         auth.authorize()
         logger.info("Authorization successful!")
     except Exception as e:
-        logger.error(f"Authorization failed: {e}")
+        logger.error("Authorization failed: %s", e)
         sys.exit(1)
 
 
 def run_sync() -> None:
     """Run the synchronization scheduler."""
+    # Imported here so --authorize doesn't load APScheduler and the collector/writer stack
+    from src.scheduler import SyncScheduler
+
     logger.info("Starting SyncBit...")
 
     scheduler = SyncScheduler()
     scheduler.start()
 
 
-def main() -> None:
-    """Main entry point."""
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
     parser = argparse.ArgumentParser(description="SyncBit - Fitbit to Victoria Metrics sync")
     parser.add_argument("--authorize", action="store_true", help="Run OAuth authorization flow")
     parser.add_argument(
@@ -67,16 +76,26 @@ def main() -> None:
         help="Set logging level",
     )
 
-    args = parser.parse_args()
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Main entry point."""
+    if len(sys.argv) > 1:
+        args = parse_args()
+        log_level, run_authorize = args.log_level, args.authorize
+    else:
+        # Default invocation (the container entrypoint) - no flags to parse
+        log_level, run_authorize = "INFO", False
 
     try:
         # Validate configuration (creates data dir)
         Config.validate()
 
         # Setup logging after data dir exists
-        setup_logging(args.log_level)
+        setup_logging(log_level)
 
-        if args.authorize:
+        if run_authorize:
             authorize()
         else:
             run_sync()
@@ -85,7 +104,7 @@ def main() -> None:
         logger.info("Interrupted by user")
         sys.exit(0)
     except Exception as e:
-        logger.error(f"Fatal error: {e}", exc_info=True)
+        logger.error("Fatal error: %s", e, exc_info=True)
         sys.exit(1)
 
 
@@ -0,0 +1,86 @@
+"""Circuit breaker for calls to external services."""
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Fails fast while a service is down instead of waiting on every timeout.
+
+    Closed: calls go through. After failure_threshold consecutive failures the
+    breaker opens and calls are rejected for reset_timeout seconds. It then
+    turns half-open and lets a single probe through: success closes it again,
+    failure re-opens it for another reset_timeout.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 3, reset_timeout: float = 60.0):
+        """Initialize a closed breaker.
+
+        Args:
+            name: Service name used in log messages
+            failure_threshold: Consecutive failures that open the breaker
+            reset_timeout: Seconds to stay open before allowing a probe
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return CLOSED
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return HALF_OPEN
+        return OPEN
+
+    @property
+    def state(self) -> str:
+        """Current state: "closed", "open" or "half_open"."""
+        with self._lock:
+            return self._state()
+
+    def allow(self) -> bool:
+        """Check whether a call may be made now.
+
+        Returns:
+            True if closed, or if half-open and no other probe is in flight
+        """
+        with self._lock:
+            state = self._state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Record a successful call, closing the breaker."""
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info(f"{self.name} recovered, closing circuit breaker")
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the breaker once the threshold is reached."""
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                logger.warning(
+                    f"{self.name} failed {self._failures} times in a row, "
+                    f"pausing calls for {self.reset_timeout:.0f}s"
+                )
+                self._opened_at = time.monotonic()
@@ -1,13 +1,33 @@
 """Configuration management for SyncBit."""
 
 import os
+import sys
 from pathlib import Path
 
 from dotenv import load_dotenv
 
 # Load environment variables from .env file (if exists)
 # Note: .envrc users (direnv/1Password) will have vars already loaded
-load_dotenv(override=False)
+# Parsed at most once per process - module globals survive importlib.reload()
+if not globals().get("_DOTENV_LOADED"):
+    load_dotenv(override=False)
+    _DOTENV_LOADED = True
+
+
+# Secret file name -> environment variable fallback
+_ENV_VAR_MAP: dict[str, str] = {
+    "fitbit_client_id": "FITBIT_CLIENT_ID",
+    "fitbit_client_secret": "FITBIT_CLIENT_SECRET",
+    "victoria_endpoint": "VICTORIA_ENDPOINT",
+    "victoria_user": "VICTORIA_USER",
+    "victoria_password": "VICTORIA_PASSWORD",
+}
+
+# Secrets are short tokens/passwords - a single read of this size covers them
+_SECRET_MAX_BYTES = 64 * 1024
+
+# Resolved secrets, keyed by secret name (secrets don't change during process lifetime)
+_SECRET_CACHE: dict[str, str] = {}
 
 
 def _load_secret(name: str) -> str:
@@ -16,6 +36,8 @@ def _load_secret(name: str) -> str:
     Production: Reads from /run/secrets/* (populated by ESO from 1Password)
     Local Dev: Falls back to environment variables
 
+    Resolved values are cached, so each secret is looked up at most once.
+
     Args:
         name: Secret file name (e.g., "fitbit_client_id")
 
@@ -25,44 +47,94 @@ def _load_secret(name: str) -> str:
     Raises:
         ValueError: If secret is not found in either location
     """
-    secret_path = Path(f"/run/secrets/{name}")
+    cached = _SECRET_CACHE.get(name)
+    if cached is not None:
+        return cached
+
+    # Try mounted file first (production) - open directly instead of exists() + read
+    try:
+        fd = os.open(f"/run/secrets/{name}", os.O_RDONLY)
+    except FileNotFoundError:
+        # Fallback to environment variable (local development)
+        env_var = _ENV_VAR_MAP.get(name, "")
+        value = os.getenv(env_var, "") if env_var else ""
+        if not value:
+            raise ValueError(
+                f"Secret not found: {name} "
+                f"(neither /run/secrets/{name} nor {env_var or 'N/A'} env var)"
+            )
+    else:
+        try:
+            value = os.read(fd, _SECRET_MAX_BYTES).strip().decode("utf-8")
+        finally:
+            os.close(fd)
+
+    _SECRET_CACHE[name] = value
+    return value
 
-    # Try mounted file first (production)
-    if secret_path.exists():
-        return secret_path.read_text().strip()
 
-    # Fallback to environment variable (local development)
-    env_var_map = {
-        "fitbit_client_id": "FITBIT_CLIENT_ID",
-        "fitbit_client_secret": "FITBIT_CLIENT_SECRET",
-        "victoria_endpoint": "VICTORIA_ENDPOINT",
-        "victoria_user": "VICTORIA_USER",
-        "victoria_password": "VICTORIA_PASSWORD",
-    }
+# Snapshot of the environment (taken once, after .env is loaded) for non-secret settings
+_ENV: dict[str, str] = dict(os.environ)
 
-    env_value = os.getenv(env_var_map.get(name, ""))
-    if not env_value:
-        raise ValueError(
-            f"Secret not found: {name} "
-            f"(neither /run/secrets/{name} nor {env_var_map.get(name, 'N/A')} env var)"
-        )
+_TRUE_VALUES = frozenset({"true", "1", "yes"})
 
-    return env_value
+
+def _env_bool(name: str, default: bool) -> bool:
+    """Read a boolean flag from the environment snapshot.
+
+    Args:
+        name: Environment variable name
+        default: Value used when the variable is unset
+
+    Returns:
+        True if the variable is "true", "1" or "yes" (case-insensitive)
+    """
+    value = _ENV.get(name)
+    if value is None:
+        return default
+    return value.lower() in _TRUE_VALUES
 
 
-class Config:
+# Config attribute -> secret name, resolved lazily on first access
+_SECRET_ATTRIBUTES: dict[str, str] = {
+    "FITBIT_CLIENT_ID": "fitbit_client_id",
+    "FITBIT_CLIENT_SECRET": "fitbit_client_secret",
+    "VICTORIA_ENDPOINT": "victoria_endpoint",
+    "VICTORIA_USER": "victoria_user",
+    "VICTORIA_PASSWORD": "victoria_password",
+}
+
+
+class _ConfigMeta(type):
+    """Metaclass that loads secret attributes on first access.
+
+    Importing Config doesn't touch /run/secrets or the environment; each
+    secret is loaded when first read and then stored on the class.
+    """
+
+    def __getattr__(cls, name: str) -> str:
+        secret_name = _SECRET_ATTRIBUTES.get(name)
+        if secret_name is None:
+            raise AttributeError(f"type object '{cls.__name__}' has no attribute '{name}'")
+
+        value = _load_secret(secret_name)
+        setattr(cls, name, value)
+        return value
+
+
+class Config(metaclass=_ConfigMeta):
     """Application configuration."""
 
-    # Fitbit OAuth2 settings (secrets - from mounted files or env vars)
-    FITBIT_CLIENT_ID: str = _load_secret("fitbit_client_id")
-    FITBIT_CLIENT_SECRET: str = _load_secret("fitbit_client_secret")
-    FITBIT_REDIRECT_URI: str = os.getenv("FITBIT_REDIRECT_URI", "http://localhost:8080/callback")
+    # Fitbit OAuth2 settings (secrets - loaded lazily from mounted files or env vars)
+    FITBIT_CLIENT_ID: str
+    FITBIT_CLIENT_SECRET: str
+    FITBIT_REDIRECT_URI: str = _ENV.get("FITBIT_REDIRECT_URI", "http://localhost:8080/callback")
 
     # Fitbit API settings
     FITBIT_API_BASE_URL: str = "https://api.fitbit.com/1/user/-"
     FITBIT_AUTH_URL: str = "https://www.fitbit.com/oauth2/authorize"
     FITBIT_TOKEN_URL: str = "https://api.fitbit.com/oauth2/token"
-    FITBIT_SCOPES: list[str] = [
+    FITBIT_SCOPES: tuple[str, ...] = (
         "activity",
         "heartrate",
         "profile",
@@ -72,72 +144,85 @@ class Config:
         "temperature",
         "cardio_fitness",
         "settings",
-    ]
+    )
 
-    # Victoria Metrics settings (secrets - from mounted files or env vars)
-    VICTORIA_ENDPOINT: str = _load_secret("victoria_endpoint")
-    VICTORIA_USER: str = _load_secret("victoria_user")
-    VICTORIA_PASSWORD: str = _load_secret("victoria_password")
+    # Victoria Metrics settings (secrets - loaded lazily from mounted files or env vars)
+    VICTORIA_ENDPOINT: str
+    VICTORIA_USER: str
+    VICTORIA_PASSWORD: str
+    # Metric lines per write request when sending several days at once
+    VM_BATCH_POINTS: int = int(_ENV.get("VM_BATCH_POINTS", "10000"))
+    # Gzip write requests of GZIP_MIN_BYTES or more (disable for proxies without gzip support)
+    VM_COMPRESS_REQUESTS: bool = _env_bool("VM_COMPRESS_REQUESTS", True)
 
     # Application settings
-    SYNC_INTERVAL_MINUTES: int = int(os.getenv("SYNC_INTERVAL_MINUTES", "15"))
-    DATA_DIR: Path = Path(os.getenv("DATA_DIR", "/app/data"))
+    SYNC_INTERVAL_MINUTES: int = int(_ENV.get("SYNC_INTERVAL_MINUTES", "15"))
+    DATA_DIR: Path = Path(_ENV.get("DATA_DIR", "/app/data"))
     TOKEN_FILE: Path = DATA_DIR / "fitbit_tokens.json"
     STATE_FILE: Path = DATA_DIR / "sync_state.json"
+    CACHE_FILE: Path = DATA_DIR / "fitbit_cache"
+    # Metrics buffered while Victoria Metrics is unreachable, replayed once it recovers
+    PENDING_WRITES_FILE: Path = DATA_DIR / "pending_writes.prom"
+    # Oldest buffered metrics are dropped beyond this size
+    VM_PENDING_MAX_MB: int = int(_ENV.get("VM_PENDING_MAX_MB", "100"))
+
+    # Cache API responses on disk so re-runs skip days already fetched
+    ENABLE_RESPONSE_CACHE: bool = _env_bool("ENABLE_RESPONSE_CACHE", True)
 
     # Backfill settings
-    BACKFILL_START_DATE: str = os.getenv("BACKFILL_START_DATE", "")  # Format: YYYY-MM-DD
+    BACKFILL_START_DATE: str = _ENV.get("BACKFILL_START_DATE", "")  # Format: YYYY-MM-DD
 
     # Sync settings
-    INCLUDE_TODAY_DATA: bool = os.getenv("INCLUDE_TODAY_DATA", "true").lower() == "true"
+    INCLUDE_TODAY_DATA: bool = _env_bool("INCLUDE_TODAY_DATA", True)
 
     # Metric collection toggles (all enabled by default for comprehensive collection)
-    COLLECT_SLEEP: bool = os.getenv("COLLECT_SLEEP", "true").lower() == "true"
-    COLLECT_SPO2: bool = os.getenv("COLLECT_SPO2", "true").lower() == "true"
-    COLLECT_BREATHING_RATE: bool = os.getenv("COLLECT_BREATHING_RATE", "true").lower() == "true"
-    COLLECT_HRV: bool = os.getenv("COLLECT_HRV", "true").lower() == "true"
-    COLLECT_CARDIO_FITNESS: bool = os.getenv("COLLECT_CARDIO_FITNESS", "true").lower() == "true"
-    COLLECT_TEMPERATURE: bool = os.getenv("COLLECT_TEMPERATURE", "true").lower() == "true"
-    COLLECT_DEVICE_INFO: bool = os.getenv("COLLECT_DEVICE_INFO", "true").lower() == "true"
+    COLLECT_SLEEP: bool = _env_bool("COLLECT_SLEEP", True)
+    COLLECT_SPO2: bool = _env_bool("COLLECT_SPO2", True)
+    COLLECT_BREATHING_RATE: bool = _env_bool("COLLECT_BREATHING_RATE", True)
+    COLLECT_HRV: bool = _env_bool("COLLECT_HRV", True)
+    COLLECT_CARDIO_FITNESS: bool = _env_bool("COLLECT_CARDIO_FITNESS", True)
+    COLLECT_TEMPERATURE: bool = _env_bool("COLLECT_TEMPERATURE", True)
+    COLLECT_DEVICE_INFO: bool = _env_bool("COLLECT_DEVICE_INFO", True)
+    # Device info changes rarely; reuse it for this long before asking Fitbit again
+    DEVICE_INFO_TTL_SECONDS: int = int(_ENV.get("DEVICE_INFO_TTL_SECONDS", "21600"))
 
     # Intraday data collection settings
-    ENABLE_INTRADAY_COLLECTION: bool = (
-        os.getenv("ENABLE_INTRADAY_COLLECTION", "false").lower() == "true"
-    )
-    INTRADAY_DETAIL_LEVEL: str = os.getenv("INTRADAY_DETAIL_LEVEL", "5min")  # 1min, 5min, 15min
-    INTRADAY_HEART_RATE_DETAIL: str = os.getenv(
+    ENABLE_INTRADAY_COLLECTION: bool = _env_bool("ENABLE_INTRADAY_COLLECTION", False)
+    INTRADAY_DETAIL_LEVEL: str = _ENV.get("INTRADAY_DETAIL_LEVEL", "5min")  # 1min, 5min, 15min
+    INTRADAY_HEART_RATE_DETAIL: str = _ENV.get(
         "INTRADAY_HEART_RATE_DETAIL", "1min"
     )  # 1sec, 1min, 5min, 15min
-    INTRADAY_RESOURCES: list[str] = [
-        r.strip()
-        for r in os.getenv("INTRADAY_RESOURCES", "steps,calories,distance,heart_rate").split(",")
-    ]
-    ENABLE_INTRADAY_BACKFILL: bool = (
-        os.getenv("ENABLE_INTRADAY_BACKFILL", "false").lower() == "true"
+    # Parsed once into an immutable tuple of interned names (usable as a cache key)
+    INTRADAY_RESOURCES: tuple[str, ...] = tuple(
+        sys.intern(r.strip())
+        for r in _ENV.get("INTRADAY_RESOURCES", "steps,calories,distance,heart_rate").split(",")
+        if r.strip()
     )
-    INTRADAY_BACKFILL_DAYS: int = int(os.getenv("INTRADAY_BACKFILL_DAYS", "30"))
+    ENABLE_INTRADAY_BACKFILL: bool = _env_bool("ENABLE_INTRADAY_BACKFILL", False)
+    INTRADAY_BACKFILL_DAYS: int = int(_ENV.get("INTRADAY_BACKFILL_DAYS", "30"))
 
     # User identification
-    FITBIT_USER_ID: str = os.getenv("FITBIT_USER_ID", "default")
+    FITBIT_USER_ID: str = _ENV.get("FITBIT_USER_ID", "default")
 
     # Logging
-    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_LEVEL: str = _ENV.get("LOG_LEVEL", "INFO")
+
+    # Settings checked by validate()
+    _REQUIRED_SETTINGS: tuple[str, ...] = tuple(_SECRET_ATTRIBUTES)
 
     @classmethod
     def validate(cls) -> None:
         """Validate required configuration."""
         errors = []
 
-        if not cls.FITBIT_CLIENT_ID:
-            errors.append("FITBIT_CLIENT_ID is required")
-        if not cls.FITBIT_CLIENT_SECRET:
-            errors.append("FITBIT_CLIENT_SECRET is required")
-        if not cls.VICTORIA_ENDPOINT:
-            errors.append("VICTORIA_ENDPOINT is required")
-        if not cls.VICTORIA_USER:
-            errors.append("VICTORIA_USER is required")
-        if not cls.VICTORIA_PASSWORD:
-            errors.append("VICTORIA_PASSWORD is required")
+        for name in cls._REQUIRED_SETTINGS:
+            try:
+                value = getattr(cls, name)
+            except ValueError:
+                # Lazily loaded secret not found in /run/secrets or env
+                value = None
+            if not value:
+                errors.append(f"{name} is required")
 
         if errors:
             raise ValueError(f"Configuration errors: {', '.join(errors)}")
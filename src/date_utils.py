@@ -0,0 +1,20 @@
+"""Helpers for the YYYY-MM-DD date strings used by the Fitbit API and sync state."""
+
+from datetime import datetime
+
+
+def parse_date(date_str: str) -> datetime:
+    """Parse a YYYY-MM-DD string into a datetime at midnight.
+
+    Uses datetime.fromisoformat, which is much faster than strptime.
+
+    Args:
+        date_str: Date string in YYYY-MM-DD format
+
+    Returns:
+        Naive datetime for the start of that day
+
+    Raises:
+        ValueError: If the string is not a valid ISO date
+    """
+    return datetime.fromisoformat(date_str)
@@ -1,15 +1,19 @@
 """Fitbit OAuth2 authentication and token management."""
 
-import json
 import logging
+import os
+import threading
+import time
 import webbrowser
-from datetime import datetime, timedelta
-from http.server import BaseHTTPRequestHandler, HTTPServer
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from urllib.parse import parse_qs, urlencode, urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
 
+from . import json_compat
 from .config import Config
 
 logger = logging.getLogger(__name__)
@@ -27,29 +31,37 @@ class TokenManager:
         self.token_file = token_file
         self.access_token: str | None = None
         self.refresh_token: str | None = None
-        self.expires_at: datetime | None = None
+        self.expires_at: float | None = None  # Unix timestamp
         self.user_id: str | None = None
+        self._parent_ready = False
+        self._token_mtime_ns: int | None = None
 
         self._load_tokens()
 
     def _load_tokens(self) -> None:
         """Load tokens from file if they exist."""
-        if self.token_file.exists():
-            try:
-                with open(self.token_file) as f:
-                    data = json.load(f)
-
-                self.access_token = data.get("access_token")
-                self.refresh_token = data.get("refresh_token")
-                self.user_id = data.get("user_id")
-
-                expires_at_str = data.get("expires_at")
-                if expires_at_str:
-                    self.expires_at = datetime.fromisoformat(expires_at_str)
-
-                logger.info(f"Loaded tokens from {self.token_file}")
-            except Exception as e:
-                logger.error(f"Error loading tokens: {e}")
+        try:
+            with open(self.token_file, "rb") as f:
+                self._token_mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+                data = json_compat.loads(f.read())
+
+            self.access_token = data.get("access_token")
+            self.refresh_token = data.get("refresh_token")
+            self.user_id = data.get("user_id")
+
+            expires_at = data.get("expires_at")
+            if isinstance(expires_at, str):
+                # Token files written by older versions store an ISO datetime
+                self.expires_at = datetime.fromisoformat(expires_at).timestamp()
+            elif expires_at is not None:
+                self.expires_at = float(expires_at)
+
+            logger.info("Loaded tokens from %s", self.token_file)
+        except FileNotFoundError:
+            # No tokens saved yet
+            return
+        except Exception as e:
+            logger.error("Error loading tokens: %s", e)
 
     def _save_tokens(self) -> None:
         """Save tokens to file."""
@@ -57,23 +69,43 @@ class TokenManager:
             "access_token": self.access_token,
             "refresh_token": self.refresh_token,
             "user_id": self.user_id,
-            "expires_at": self.expires_at.isoformat() if self.expires_at else None,
+            "expires_at": self.expires_at,
         }
 
         try:
-            # Ensure parent directory exists
-            self.token_file.parent.mkdir(parents=True, exist_ok=True)
-
-            with open(self.token_file, "w") as f:
-                json.dump(data, f, indent=2)
-
-            # Set restrictive permissions
-            self.token_file.chmod(0o600)
-            logger.info(f"Saved tokens to {self.token_file}")
+            # Ensure parent directory exists (only checked on first save)
+            if not self._parent_ready:
+                self.token_file.parent.mkdir(parents=True, exist_ok=True)
+                self._parent_ready = True
+
+            # Write to a temp file created with restrictive permissions, then atomically
+            # replace the token file so it's never partially written or world-readable
+            tmp_file = self.token_file.with_name(f"{self.token_file.name}.tmp")
+            fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                f.write(json_compat.dumps(data, indent=True))
+            os.replace(tmp_file, self.token_file)
+            self._token_mtime_ns = os.stat(self.token_file).st_mtime_ns
+
+            logger.info("Saved tokens to %s", self.token_file)
         except Exception as e:
-            logger.error(f"Error saving tokens: {e}")
+            logger.error("Error saving tokens: %s", e)
             raise
 
+    def reload_if_changed(self) -> None:
+        """Reload tokens only if the token file changed since last load/save.
+
+        Handles tokens refreshed by another process without re-reading and
+        re-parsing the file when nothing changed.
+        """
+        try:
+            mtime_ns = os.stat(self.token_file).st_mtime_ns
+        except FileNotFoundError:
+            return
+
+        if mtime_ns != self._token_mtime_ns:
+            self._load_tokens()
+
     def update_tokens(self, token_response: dict) -> None:
         """Update tokens from OAuth response.
 
@@ -86,16 +118,14 @@ class TokenManager:
 
         # Tokens expire in 8 hours, set expiry slightly earlier for safety
         expires_in = token_response.get("expires_in", 28800)  # Default 8 hours
-        self.expires_at = datetime.now() + timedelta(seconds=expires_in - 300)  # 5 min buffer
+        self.expires_at = time.time() + expires_in - 300  # 5 min buffer
 
         self._save_tokens()
-        logger.info(f"Updated tokens, expires at {self.expires_at}")
+        logger.info("Updated tokens, expires at %s", datetime.fromtimestamp(self.expires_at))
 
     def is_expired(self) -> bool:
         """Check if access token is expired."""
-        if not self.expires_at:
-            return True
-        return datetime.now() >= self.expires_at
+        return self.expires_at is None or time.time() >= self.expires_at
 
     def has_tokens(self) -> bool:
         """Check if we have valid tokens."""
@@ -106,6 +136,7 @@ class CallbackHandler(BaseHTTPRequestHandler):
     """HTTP handler for OAuth callback."""
 
     authorization_code: str | None = None
+    code_received = threading.Event()
 
     def do_GET(self):
         """Handle GET request from OAuth callback."""
@@ -114,6 +145,7 @@ class CallbackHandler(BaseHTTPRequestHandler):
 
         if "code" in params:
             CallbackHandler.authorization_code = params["code"][0]
+            CallbackHandler.code_received.set()
             self.send_response(200)
             self.send_header("Content-type", "text/html")
             self.end_headers()
@@ -147,22 +179,31 @@ class FitbitAuth:
         self.client_secret = Config.FITBIT_CLIENT_SECRET
         self.redirect_uri = Config.FITBIT_REDIRECT_URI
         self.token_manager = TokenManager(Config.TOKEN_FILE)
+        self._auth_url: str | None = None
+        # Serializes expiry checks/refreshes when collectors fetch from several threads
+        self._token_lock = threading.Lock()
+
+        # Reuse one keep-alive connection to the token endpoint across exchanges/refreshes
+        self._session = requests.Session()
+        self._session.auth = (self.client_id, self.client_secret)
+        self._session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=2))
 
     def get_authorization_url(self) -> str:
         """Generate authorization URL for user consent.
 
         Returns:
-            Authorization URL
+            Authorization URL (built once and cached)
         """
-        params = {
-            "client_id": self.client_id,
-            "response_type": "code",
-            "scope": " ".join(Config.FITBIT_SCOPES),
-            "redirect_uri": self.redirect_uri,
-        }
+        if self._auth_url is None:
+            params = {
+                "client_id": self.client_id,
+                "response_type": "code",
+                "scope": " ".join(Config.FITBIT_SCOPES),
+                "redirect_uri": self.redirect_uri,
+            }
+            self._auth_url = f"{Config.FITBIT_AUTH_URL}?{urlencode(params)}"
 
-        url = f"{Config.FITBIT_AUTH_URL}?{urlencode(params)}"
-        return url
+        return self._auth_url
 
     def exchange_code_for_token(self, authorization_code: str) -> None:
         """Exchange authorization code for access token.
@@ -183,9 +224,7 @@ class FitbitAuth:
             "Content-Type": "application/x-www-form-urlencoded",
         }
 
-        response = requests.post(
-            token_url, data=data, headers=headers, auth=(self.client_id, self.client_secret)
-        )
+        response = self._session.post(token_url, data=data, headers=headers)
 
         if response.status_code != 200:
             raise Exception(f"Token exchange failed: {response.text}")
@@ -197,7 +236,7 @@ class FitbitAuth:
         """Refresh access token using refresh token."""
         # Reload tokens from file to get the latest refresh token
         # This handles cases where tokens were refreshed by another process
-        self.token_manager._load_tokens()
+        self.token_manager.reload_if_changed()
 
         if not self.token_manager.refresh_token:
             raise Exception("No refresh token available")
@@ -213,9 +252,7 @@ class FitbitAuth:
             "Content-Type": "application/x-www-form-urlencoded",
         }
 
-        response = requests.post(
-            token_url, data=data, headers=headers, auth=(self.client_id, self.client_secret)
-        )
+        response = self._session.post(token_url, data=data, headers=headers)
 
         if response.status_code != 200:
             raise Exception(f"Token refresh failed: {response.text}")
@@ -229,14 +266,15 @@ class FitbitAuth:
         Returns:
             Valid access token
         """
-        if not self.token_manager.has_tokens():
-            raise Exception("No tokens available. Please authorize first.")
+        with self._token_lock:
+            if not self.token_manager.has_tokens():
+                raise Exception("No tokens available. Please authorize first.")
 
-        if self.token_manager.is_expired():
-            logger.info("Access token expired, refreshing...")
-            self.refresh_access_token()
+            if self.token_manager.is_expired():
+                logger.info("Access token expired, refreshing...")
+                self.refresh_access_token()
 
-        return self.token_manager.access_token
+            return self.token_manager.access_token
 
     def authorize(self, port: int = 8080) -> None:
         """Complete OAuth2 authorization flow with local callback server.
@@ -246,7 +284,11 @@ class FitbitAuth:
         """
         # Start local server for callback
         # Bind to 0.0.0.0 to allow access from outside container (Docker/K8s)
-        server = HTTPServer(("0.0.0.0", port), CallbackHandler)
+        # Threaded so stray requests (e.g. favicon) don't block the callback
+        CallbackHandler.authorization_code = None
+        CallbackHandler.code_received.clear()
+        server = ThreadingHTTPServer(("0.0.0.0", port), CallbackHandler)
+        server.timeout = 1
 
         # Open browser for authorization
         auth_url = self.get_authorization_url()
@@ -257,9 +299,12 @@ class FitbitAuth:
         print(f"If the browser doesn't open, visit: {auth_url}\n")
 
         # Wait for callback
-        logger.info(f"Waiting for callback on port {port}...")
-        while CallbackHandler.authorization_code is None:
-            server.handle_request()
+        logger.info("Waiting for callback on port %s...", port)
+        try:
+            while not CallbackHandler.code_received.is_set():
+                server.handle_request()
+        finally:
+            server.server_close()
 
         # Exchange code for token
         self.exchange_code_for_token(CallbackHandler.authorization_code)
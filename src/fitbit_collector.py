@@ -1,16 +1,129 @@
 """Fitbit data collector for activity, heart rate, and steps."""
 
 import logging
+import math
+import random
+import threading
 import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 import requests
+from requests.adapters import HTTPAdapter
 
+from . import json_compat
 from .config import Config
+from .date_utils import parse_date
 from .fitbit_auth import FitbitAuth
+from .rate_limiter import ShutdownRequested, TokenBucket
+from .response_cache import ResponseCache
 
 logger = logging.getLogger(__name__)
 
+# (connect, read) timeout in seconds for Fitbit API requests
+REQUEST_TIMEOUT = (5, 30)
+
+# Attempts for transient failures (connection errors, timeouts, 5xx responses)
+MAX_ATTEMPTS = 5
+# Upper bound for a single backoff delay in seconds
+MAX_BACKOFF_SECONDS = 60
+
+# Seconds an activity summary is reused in memory (e.g. get_steps after get_daily_data)
+SUMMARY_CACHE_SECONDS = 60
+
+# Worker threads used to fetch a day's optional metrics concurrently
+OPTIONAL_METRIC_WORKERS = 6
+
+# Worker threads used to fetch a chunk's range requests concurrently
+RANGE_FETCH_WORKERS = 5
+
+# Maximum span Fitbit accepts for activity and heart rate range requests
+MAX_RANGE_DAYS = 100
+
+# Activity time series fetched for range requests, keyed to their daily summary field
+_RANGE_ACTIVITY_RESOURCES = {
+    "distance": "distance",
+    "calories": "caloriesOut",
+    "minutesSedentary": "sedentaryMinutes",
+    "minutesLightlyActive": "lightlyActiveMinutes",
+    "minutesFairlyActive": "fairlyActiveMinutes",
+    "minutesVeryActive": "veryActiveMinutes",
+}
+_INT_SUMMARY_KEYS = (
+    "caloriesOut",
+    "sedentaryMinutes",
+    "lightlyActiveMinutes",
+    "fairlyActiveMinutes",
+    "veryActiveMinutes",
+)
+
+# Heart rate zone fields kept in daily data
+_ZONE_KEYS = ("name", "min", "max", "minutes", "caloriesOut")
+
+
+def _date_str(date: datetime) -> str:
+    """Format a date as YYYY-MM-DD for Fitbit API paths.
+
+    Args:
+        date: Date (or datetime) to format
+
+    Returns:
+        ISO date string
+    """
+    return date.isoformat()[:10]
+
+
+def _is_transient(error: Exception) -> bool:
+    """Check whether a request error is worth retrying.
+
+    Args:
+        error: Exception raised while making a request
+
+    Returns:
+        True for connection errors, timeouts and 5xx responses
+    """
+    if isinstance(error, requests.exceptions.ConnectionError | requests.exceptions.Timeout):
+        return True
+    response = getattr(error, "response", None)
+    return (
+        isinstance(error, requests.exceptions.HTTPError)
+        and response is not None
+        and response.status_code >= 500
+    )
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Exponential backoff with full jitter.
+
+    Args:
+        attempt: Number of failed attempts so far (1-based)
+
+    Returns:
+        Seconds to wait before the next attempt
+    """
+    return random.uniform(0, min(MAX_BACKOFF_SECONDS, 2**attempt))
+
+
+def _not_found_error(url: str) -> requests.exceptions.HTTPError:
+    """Build the HTTPError a 404 response for a URL would raise.
+
+    Used when the response cache already knows an endpoint has no data, so
+    callers handle it exactly like a live 404.
+
+    Args:
+        url: Request URL
+
+    Returns:
+        HTTPError carrying a 404 response
+    """
+    response = requests.Response()
+    response.status_code = 404
+    response.url = url
+    return requests.exceptions.HTTPError(
+        f"404 Client Error: Not Found for url: {url}", response=response
+    )
+
 
 class RateLimitError(Exception):
     """Exception raised when rate limited by Fitbit API."""
@@ -18,7 +131,7 @@ class RateLimitError(Exception):
     def __init__(
         self,
         message: str,
-        retry_after: int,
+        retry_after: int = 60,
         quota_reset: int | None = None,
         remaining: int | None = None,
     ):
@@ -39,14 +152,158 @@ class RateLimitError(Exception):
 class FitbitCollector:
     """Collects data from Fitbit API."""
 
-    def __init__(self, auth: FitbitAuth):
+    def __init__(
+        self,
+        auth: FitbitAuth,
+        cache: ResponseCache | None = None,
+        stop_event: threading.Event | None = None,
+    ):
         """Initialize collector.
 
         Args:
             auth: Fitbit authentication handler
+            cache: Optional response cache consulted before hitting the API
+            stop_event: Event set on shutdown to abandon rate limit and retry waits
         """
         self.auth = auth
         self.base_url = Config.FITBIT_API_BASE_URL
+        self.cache = cache
+
+        # Pooled keep-alive connections to api.fitbit.com, reused across all requests
+        self._session = requests.Session()
+        self._session.mount(
+            "https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0)
+        )
+        self._session_token: str | None = None
+        self._session_lock = threading.Lock()
+
+        # Quota state from the most recent Fitbit-Rate-Limit-* response headers
+        self.rate_limit_remaining: int | None = None
+        self.rate_limit_reset: int | None = None
+
+        # Intraday fetcher and its arguments after the date, per configured resource
+        self._intraday_dispatch: dict[str, tuple[Callable[..., dict], tuple]] = {
+            resource: (
+                (self.get_intraday_heart_rate, (Config.INTRADAY_HEART_RATE_DETAIL,))
+                if resource == "heart_rate"
+                else (self.get_intraday_activity, (resource, Config.INTRADAY_DETAIL_LEVEL))
+            )
+            for resource in Config.INTRADAY_RESOURCES
+        }
+
+        # Recently fetched activity summaries: date string -> (fetched at, summary)
+        self._summary_cache: dict[str, tuple[float, dict]] = {}
+
+        # Shared request budget (150 req/hour) replaces fixed sleeps between calls
+        self._stop_event = stop_event or threading.Event()
+        self._bucket = TokenBucket(stop_event=self._stop_event)
+        # Monotonic time the last request was sent, for cooldowns between runs
+        self._last_request: float | None = None
+
+    def _authorize_session(self) -> None:
+        """Ensure the session sends a valid bearer token.
+
+        The Authorization header is only rebuilt when the token changes.
+        """
+        token = self.auth.get_valid_token()
+        with self._session_lock:
+            if token != self._session_token:
+                self._session.headers["Authorization"] = f"Bearer {token}"
+                self._session_token = token
+
+    def _record_rate_limit(self, response: requests.Response) -> None:
+        """Remember the quota reported by Fitbit's rate limit headers.
+
+        Args:
+            response: Any Fitbit API response
+        """
+        try:
+            remaining = int(response.headers["Fitbit-Rate-Limit-Remaining"])
+            reset = int(response.headers["Fitbit-Rate-Limit-Reset"])
+        except (KeyError, ValueError, TypeError):
+            return
+        self.rate_limit_remaining = remaining
+        self.rate_limit_reset = reset
+        self._bucket.sync_from_headers(remaining, reset)
+
+    def get_pacing_delay(self, fallback: float = 30.0) -> float:
+        """Get how long to wait before the next request to spread the remaining quota.
+
+        Args:
+            fallback: Delay to use when no rate limit headers have been seen
+
+        Returns:
+            Seconds to wait: quota reset time divided evenly over the
+            remaining requests (at least 1 second)
+        """
+        if self.rate_limit_remaining is None or self.rate_limit_reset is None:
+            return fallback
+        return max(1.0, self.rate_limit_reset / max(self.rate_limit_remaining, 1))
+
+    def _wait(self, seconds: float) -> None:
+        """Wait before retrying, giving up early if shutdown is requested.
+
+        Args:
+            seconds: Time to wait
+
+        Raises:
+            ShutdownRequested: If shutdown is requested while waiting
+        """
+        if self._stop_event.wait(seconds):
+            raise ShutdownRequested("Shutdown requested while waiting to retry")
+
+    def seconds_since_last_request(self) -> float:
+        """Get how long ago the last Fitbit API request was sent.
+
+        Returns:
+            Seconds since the last request, or infinity if none was made yet
+        """
+        if self._last_request is None:
+            return math.inf
+        return time.monotonic() - self._last_request
+
+    def _get(
+        self, url: str, params: dict | None = None, headers: dict | None = None
+    ) -> requests.Response:
+        """GET a Fitbit API URL, retrying transient failures with backoff.
+
+        Connection errors, timeouts and 5xx responses are retried up to
+        MAX_ATTEMPTS times with jittered exponential backoff. Other HTTP
+        errors (including 429) are raised immediately.
+
+        Args:
+            url: Full request URL
+            params: Query parameters
+            headers: Extra request headers
+
+        Returns:
+            Successful (or 304 Not Modified) response
+
+        Raises:
+            requests.exceptions.RequestException: If the request keeps failing
+            ShutdownRequested: If shutdown is requested while waiting
+        """
+        self._authorize_session()
+
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            try:
+                self._bucket.acquire()
+                self._last_request = time.monotonic()
+                response = self._session.get(
+                    url, params=params, headers=headers, timeout=REQUEST_TIMEOUT
+                )
+                self._record_rate_limit(response)
+                response.raise_for_status()
+                return response
+            except requests.exceptions.RequestException as e:
+                if attempt == MAX_ATTEMPTS or not _is_transient(e):
+                    raise
+                delay = _backoff_delay(attempt)
+                logger.warning(
+                    f"Transient error on attempt {attempt}/{MAX_ATTEMPTS}: {e}, "
+                    f"retrying in {delay:.1f}s"
+                )
+                self._wait(delay)
 
     def _make_request(self, endpoint: str, params: dict | None = None) -> dict:
         """Make authenticated request to Fitbit API.
@@ -58,18 +315,31 @@ class FitbitCollector:
         Returns:
             Response JSON
         """
-        token = self.auth.get_valid_token()
-
-        headers = {
-            "Authorization": f"Bearer {token}",
-        }
-
-        url = f"{self.base_url}{endpoint}"
+        cache_key = entry = None
+        headers = None
+        if self.cache is not None:
+            cache_key = self.cache.key(endpoint, params)
+            entry = self.cache.get(cache_key)
+            if entry is not None:
+                if self.cache.is_fresh(entry, endpoint):
+                    logger.debug(f"Cache hit for {endpoint}")
+                    if entry.get("not_found"):
+                        raise _not_found_error(self.base_url + endpoint)
+                    return entry["data"]
+                headers = self.cache.conditional_headers(entry) or None
+
+        url = self.base_url + endpoint
 
         try:
-            response = requests.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            return response.json()
+            response = self._get(url, params=params, headers=headers)
+            if response.status_code == 304 and entry is not None:
+                # Unchanged since last fetch
+                self.cache.touch(cache_key, entry)
+                return entry["data"]
+            data = json_compat.loads(response.content)
+            if self.cache is not None:
+                self.cache.set(cache_key, data, response.headers)
+            return data
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 429:
                 # Rate limited - extract retry time and quota info from headers
@@ -99,6 +369,9 @@ class FitbitCollector:
                     quota_reset=quota_reset,
                     remaining=remaining,
                 )
+            if e.response.status_code == 404 and self.cache is not None:
+                # Remember missing data so later runs skip the round-trip
+                self.cache.set_not_found(cache_key)
             logger.error(f"API request failed: {e}")
             raise
 
@@ -109,15 +382,28 @@ class FitbitCollector:
             date: Date to fetch data for
 
         Returns:
-            Activity summary data
+            Activity summary data (reused for SUMMARY_CACHE_SECONDS)
         """
-        date_str = date.strftime("%Y-%m-%d")
+        date_str = _date_str(date)
+        now = time.monotonic()
+        cached = self._summary_cache.get(date_str)
+        if cached is not None and now - cached[0] < SUMMARY_CACHE_SECONDS:
+            return cached[1]
+
         endpoint = f"/activities/date/{date_str}.json"
 
         logger.debug(f"Fetching activity summary for {date_str}")
         data = self._make_request(endpoint)
+        summary = data.get("summary", {})
 
-        return data.get("summary", {})
+        # Drop expired entries so long backfills don't accumulate summaries
+        self._summary_cache = {
+            key: entry
+            for key, entry in self._summary_cache.items()
+            if now - entry[0] < SUMMARY_CACHE_SECONDS
+        }
+        self._summary_cache[date_str] = (now, summary)
+        return summary
 
     def get_heart_rate(self, date: datetime) -> dict:
         """Get heart rate data for a specific date.
@@ -128,7 +414,7 @@ class FitbitCollector:
         Returns:
             Heart rate data
         """
-        date_str = date.strftime("%Y-%m-%d")
+        date_str = _date_str(date)
         endpoint = f"/activities/heart/date/{date_str}/1d.json"
 
         logger.debug(f"Fetching heart rate for {date_str}")
@@ -148,27 +434,125 @@ class FitbitCollector:
         Returns:
             Step count
         """
-        # Steps are part of activity summary, but also available separately
+        # Steps are part of activity summary (reused if it was just fetched)
         activity = self.get_activity_summary(date)
         return activity.get("steps", 0)
 
-    def get_daily_data(self, date: datetime) -> dict:
-        """Get all daily data for a specific date.
+    def get_activity_time_series(
+        self, resource: str, start_date: datetime, end_date: datetime
+    ) -> dict[str, str]:
+        """Get daily values of an activity resource for a date range.
 
         Args:
-            date: Date to fetch data for
+            resource: Activity resource (steps, distance, calories, minutesSedentary, ...)
+            start_date: Start date (inclusive)
+            end_date: End date (inclusive, at most MAX_RANGE_DAYS after start)
 
         Returns:
-            Combined daily data including all enabled metrics
+            Mapping of date string to the raw value for that day
         """
-        logger.info(f"Collecting data for {date.strftime('%Y-%m-%d')}")
+        start_str = _date_str(start_date)
+        end_str = _date_str(end_date)
+        endpoint = f"/activities/{resource}/date/{start_str}/{end_str}.json"
 
-        # Core metrics (always collected)
-        activity = self.get_activity_summary(date)
-        heart_rate = self.get_heart_rate(date)
+        logger.debug(f"Fetching {resource} time series for {start_str} to {end_str}")
+        data = self._make_request(endpoint)
+
+        return {day["dateTime"]: day["value"] for day in data.get(f"activities-{resource}", [])}
+
+    def get_steps_range(self, start_date: datetime, end_date: datetime) -> dict[str, int]:
+        """Get daily step counts for a date range.
+
+        Args:
+            start_date: Start date (inclusive)
+            end_date: End date (inclusive)
+
+        Returns:
+            Mapping of date string to step count
+        """
+        series = self.get_activity_time_series("steps", start_date, end_date)
+        return {day: int(value) for day, value in series.items()}
+
+    def get_heart_rate_range(self, start_date: datetime, end_date: datetime) -> dict[str, dict]:
+        """Get daily heart rate data for a date range.
 
-        data = {
-            "date": date.strftime("%Y-%m-%d"),
+        Args:
+            start_date: Start date (inclusive)
+            end_date: End date (inclusive)
+
+        Returns:
+            Mapping of date string to heart rate data (same shape as get_heart_rate)
+        """
+        start_str = _date_str(start_date)
+        end_str = _date_str(end_date)
+        endpoint = f"/activities/heart/date/{start_str}/{end_str}.json"
+
+        logger.debug(f"Fetching heart rate for {start_str} to {end_str}")
+        data = self._make_request(endpoint)
+
+        return {day["dateTime"]: day.get("value", {}) for day in data.get("activities-heart", [])}
+
+    def get_daily_core_range(
+        self, start_date: datetime, end_date: datetime
+    ) -> dict[str, tuple[dict, dict]]:
+        """Get core activity and heart rate data for a date range.
+
+        Issues one request per activity resource plus one for heart rate,
+        regardless of how many days the range covers. The requests run
+        concurrently; the shared token bucket still caps the request rate.
+
+        Args:
+            start_date: Start date (inclusive)
+            end_date: End date (inclusive)
+
+        Returns:
+            Mapping of date string to (activity summary, heart rate) in the
+            shapes returned by get_activity_summary and get_heart_rate
+        """
+        # The range requests are independent, so run them concurrently
+        with ThreadPoolExecutor(max_workers=RANGE_FETCH_WORKERS) as executor:
+            steps_future = executor.submit(self.get_steps_range, start_date, end_date)
+            series_futures = {
+                summary_key: executor.submit(
+                    self.get_activity_time_series, resource, start_date, end_date
+                )
+                for resource, summary_key in _RANGE_ACTIVITY_RESOURCES.items()
+            }
+            heart_rate_future = executor.submit(self.get_heart_rate_range, start_date, end_date)
+
+        steps = steps_future.result()
+        series = {key: future.result() for key, future in series_futures.items()}
+        heart_rate = heart_rate_future.result()
+
+        core = {}
+        for day, day_steps in steps.items():
+            activity = {"steps": day_steps}
+            for summary_key, values in series.items():
+                if day in values:
+                    activity[summary_key] = float(values[day])
+            if "distance" in activity:
+                activity["distances"] = [
+                    {"activity": "total", "distance": activity.pop("distance")}
+                ]
+            for summary_key in _INT_SUMMARY_KEYS:
+                if summary_key in activity:
+                    activity[summary_key] = int(activity[summary_key])
+            core[day] = (activity, heart_rate.get(day, {}))
+        return core
+
+    def _build_daily_data(self, date: datetime, activity: dict, heart_rate: dict) -> dict:
+        """Build the core daily record from activity summary and heart rate data.
+
+        Args:
+            date: Date the data belongs to
+            activity: Activity summary (as returned by get_activity_summary)
+            heart_rate: Heart rate data (as returned by get_heart_rate)
+
+        Returns:
+            Daily data without optional metrics
+        """
+        return {
+            "date": _date_str(date),
             "timestamp": int(date.timestamp()),
             "steps": activity.get("steps", 0),
             "distance": (
@@ -185,76 +569,156 @@ class FitbitCollector:
             },
             "heart_rate": {
                 "resting": heart_rate.get("restingHeartRate", 0),
-                "zones": heart_rate.get("heartRateZones", []),
+                # Copy just the fields we use so the parsed response isn't retained
+                "zones": [
+                    {key: zone[key] for key in _ZONE_KEYS if key in zone}
+                    for zone in heart_rate.get("heartRateZones", ())
+                ],
             },
         }
 
-        # Optional metrics based on configuration
-        if Config.COLLECT_SLEEP:
-            try:
-                data["sleep"] = self.get_sleep_data(date)
-                time.sleep(5)  # Rate limit delay
-            except RateLimitError:
-                raise  # Re-raise rate limit errors to be handled by scheduler
-            except Exception as e:
-                logger.error(f"Error collecting sleep data: {e}")
-                data["sleep"] = {}
+    def _add_optional_metrics(self, date: datetime, data: dict) -> dict:
+        """Collect the optional metrics enabled in configuration into a daily record.
 
-        if Config.COLLECT_SPO2:
-            try:
-                data["spo2"] = self.get_spo2_data(date)
-                time.sleep(5)  # Rate limit delay
-            except RateLimitError:
-                raise  # Re-raise rate limit errors to be handled by scheduler
-            except Exception as e:
-                logger.error(f"Error collecting SpO2 data: {e}")
-                data["spo2"] = {}
+        The metrics are independent, so they are fetched concurrently; the
+        shared token bucket still enforces the overall rate limit.
 
-        if Config.COLLECT_BREATHING_RATE:
-            try:
-                data["breathing_rate"] = self.get_breathing_rate(date)
-                time.sleep(5)  # Rate limit delay
-            except RateLimitError:
-                raise  # Re-raise rate limit errors to be handled by scheduler
-            except Exception as e:
-                logger.error(f"Error collecting breathing rate: {e}")
-                data["breathing_rate"] = []
+        Args:
+            date: Date to fetch data for
+            data: Daily record to extend
 
-        if Config.COLLECT_HRV:
-            try:
-                data["hrv"] = self.get_hrv_data(date)
-                time.sleep(5)  # Rate limit delay
-            except RateLimitError:
-                raise  # Re-raise rate limit errors to be handled by scheduler
-            except Exception as e:
-                logger.error(f"Error collecting HRV data: {e}")
-                data["hrv"] = []
+        Returns:
+            The same daily record
 
-        if Config.COLLECT_CARDIO_FITNESS:
-            try:
-                data["cardio_fitness"] = self.get_cardio_fitness_score(date)
-                time.sleep(5)  # Rate limit delay
-            except RateLimitError:
-                raise  # Re-raise rate limit errors to be handled by scheduler
-            except Exception as e:
-                logger.error(f"Error collecting cardio fitness: {e}")
-                data["cardio_fitness"] = []
+        Raises:
+            RateLimitError: If any metric was rate limited
+            ShutdownRequested: If shutdown was requested while fetching
+        """
+        # (key, fetcher, value on error, description), in the order they are stored
+        metrics = [
+            (key, fetch, default, name)
+            for enabled, key, fetch, default, name in (
+                (Config.COLLECT_SLEEP, "sleep", self.get_sleep_data, {}, "sleep data"),
+                (Config.COLLECT_SPO2, "spo2", self.get_spo2_data, {}, "SpO2 data"),
+                (
+                    Config.COLLECT_BREATHING_RATE,
+                    "breathing_rate",
+                    self.get_breathing_rate,
+                    [],
+                    "breathing rate",
+                ),
+                (Config.COLLECT_HRV, "hrv", self.get_hrv_data, [], "HRV data"),
+                (
+                    Config.COLLECT_CARDIO_FITNESS,
+                    "cardio_fitness",
+                    self.get_cardio_fitness_score,
+                    [],
+                    "cardio fitness",
+                ),
+                (
+                    Config.COLLECT_TEMPERATURE,
+                    "temperature",
+                    self.get_temperature_data,
+                    [],
+                    "temperature data",
+                ),
+            )
+            if enabled
+        ]
+        if not metrics:
+            return data
+
+        with ThreadPoolExecutor(max_workers=min(OPTIONAL_METRIC_WORKERS, len(metrics))) as executor:
+            futures = [
+                (key, executor.submit(fetch, date), default, name)
+                for key, fetch, default, name in metrics
+            ]
 
-        if Config.COLLECT_TEMPERATURE:
+        rate_limit_error = None
+        for key, future, default, name in futures:
             try:
-                data["temperature"] = self.get_temperature_data(date)
-                time.sleep(5)  # Rate limit delay
-            except RateLimitError:
-                raise  # Re-raise rate limit errors to be handled by scheduler
+                data[key] = future.result()
+            except RateLimitError as e:
+                rate_limit_error = rate_limit_error or e
+            except ShutdownRequested:
+                # An incomplete day must not be recorded as synced
+                raise
             except Exception as e:
-                logger.error(f"Error collecting temperature data: {e}")
-                data["temperature"] = []
+                logger.error(f"Error collecting {name}: {e}")
+                data[key] = default
+
+        if rate_limit_error is not None:
+            raise rate_limit_error  # Re-raise rate limit errors to be handled by scheduler
 
         return data
 
+    def get_daily_data(self, date: datetime) -> dict:
+        """Get all daily data for a specific date.
+
+        Args:
+            date: Date to fetch data for
+
+        Returns:
+            Combined daily data including all enabled metrics, or zeroed core
+            metrics flagged with "empty": True if the day has no activity summary
+        """
+        logger.info(f"Collecting data for {_date_str(date)}")
+
+        # Core metrics (always collected)
+        activity = self.get_activity_summary(date)
+        if not activity:
+            # No device data for the day: skip heart rate and optional metrics
+            logger.debug(f"No activity summary for {_date_str(date)}, skipping other metrics")
+            data = self._build_daily_data(date, {}, {})
+            data["empty"] = True
+            return data
+
+        heart_rate = self.get_heart_rate(date)
+
+        data = self._build_daily_data(date, activity, heart_rate)
+
+        # Optional metrics based on configuration
+        return self._add_optional_metrics(date, data)
+
+    def _get_core_range_waiting_on_rate_limit(
+        self, start_date: datetime, end_date: datetime
+    ) -> dict[str, tuple[dict, dict]]:
+        """Fetch core data for a range, waiting out rate limits.
+
+        Args:
+            start_date: Start date (inclusive)
+            end_date: End date (inclusive)
+
+        Returns:
+            Core data by date, or an empty dict if the range could not be
+            fetched (callers fall back to per-day requests)
+        """
+        while True:
+            try:
+                return self.get_daily_core_range(start_date, end_date)
+            except RateLimitError as e:
+                logger.warning(
+                    f"Rate limited fetching {_date_str(start_date)} to "
+                    f"{_date_str(end_date)}, waiting {e.retry_after} seconds "
+                    "as requested by Fitbit..."
+                )
+                self._wait(e.retry_after)
+            except ShutdownRequested:
+                raise
+            except Exception as e:
+                logger.error(
+                    f"Failed to fetch range {_date_str(start_date)} to "
+                    f"{_date_str(end_date)}, falling back to per-day requests: {e}"
+                )
+                return {}
+
     def get_historical_data(self, start_date: datetime, end_date: datetime) -> list[dict]:
         """Get historical data for a date range.
 
+        Core activity and heart rate metrics are fetched with range requests
+        in chunks of up to MAX_RANGE_DAYS days; optional metrics, which lack
+        a comparable range form, are still fetched per day.
+
         Args:
             start_date: Start date (inclusive)
             end_date: End date (inclusive)
@@ -262,56 +726,46 @@ class FitbitCollector:
         Returns:
             List of daily data
         """
-        data_points = []
+        # One slot per day; skipped days stay None and are dropped at the end
+        data_points: list[dict | None] = [None] * max((end_date - start_date).days + 1, 0)
         current_date = start_date
-        retry_count = 0
-        max_retries = 3
+        core: dict[str, tuple[dict, dict]] = {}
+        chunk_end = current_date - timedelta(days=1)
 
         while current_date <= end_date:
-            try:
-                daily_data = self.get_daily_data(current_date)
-                data_points.append(daily_data)
-                retry_count = 0  # Reset retry counter on success
+            if current_date > chunk_end:
+                chunk_end = min(current_date + timedelta(days=MAX_RANGE_DAYS - 1), end_date)
+                core = self._get_core_range_waiting_on_rate_limit(current_date, chunk_end)
 
-                # Add delay to respect rate limits (150 req/hour = 1 req every 24 seconds)
-                # We make 2 requests per day (activity + heart rate), so wait 30 seconds
-                time.sleep(30)
+            date_str = _date_str(current_date)
+            try:
+                if date_str in core:
+                    logger.info(f"Collecting data for {date_str}")
+                    daily_data = self._build_daily_data(current_date, *core[date_str])
+                    self._add_optional_metrics(current_date, daily_data)
+                else:
+                    daily_data = self.get_daily_data(current_date)
+                data_points[(current_date - start_date).days] = daily_data
 
             except RateLimitError as e:
                 # Use the exact retry time from Fitbit
-                retry_after = e.retry_after
                 logger.warning(
-                    f"Rate limited on {current_date.strftime('%Y-%m-%d')}, "
-                    f"waiting {retry_after} seconds as requested by Fitbit..."
+                    f"Rate limited on {date_str}, "
+                    f"waiting {e.retry_after} seconds as requested by Fitbit..."
                 )
-                time.sleep(retry_after)
-                continue  # Retry this date without incrementing
-
-            except requests.exceptions.HTTPError as e:
-                retry_count += 1
-                if retry_count >= max_retries:
-                    logger.error(
-                        f"Failed to fetch data for {current_date.strftime('%Y-%m-%d')} "
-                        f"after {max_retries} retries: {e}"
-                    )
-                    retry_count = 0
-                    current_date += timedelta(days=1)  # Skip this date and move on
-                else:
-                    logger.warning(
-                        f"Error fetching {current_date.strftime('%Y-%m-%d')}, "
-                        f"retry {retry_count}/{max_retries}"
-                    )
-                    time.sleep(5)  # Short delay before retry
-                    continue
+                self._wait(e.retry_after)
+                continue  # Retry this date
+
+            except ShutdownRequested:
+                raise
 
             except Exception as e:
-                logger.error(f"Unexpected error for {current_date.strftime('%Y-%m-%d')}: {e}")
-                current_date += timedelta(days=1)  # Skip and continue
-            else:
-                # Only increment date if no exception or after max retries
-                current_date += timedelta(days=1)
+                # Transient errors were already retried with backoff in _get()
+                logger.error(f"Failed to fetch data for {date_str}: {e}")
+
+            current_date += timedelta(days=1)
 
-        return data_points
+        return [daily_data for daily_data in data_points if daily_data is not None]
 
     def get_first_available_date(self) -> datetime | None:
         """Attempt to find the first date with available data.
@@ -324,18 +778,14 @@ class FitbitCollector:
         """
         # Try to get member since date from profile
         try:
-            token = self.auth.get_valid_token()
-            headers = {"Authorization": f"Bearer {token}"}
+            response = self._get("https://api.fitbit.com/1/user/-/profile.json")
 
-            response = requests.get("https://api.fitbit.com/1/user/-/profile.json", headers=headers)
-            response.raise_for_status()
-
-            profile = response.json().get("user", {})
+            profile = json_compat.loads(response.content).get("user", {})
             member_since = profile.get("memberSince")
 
             if member_since:
                 logger.info(f"User member since: {member_since}")
-                return datetime.strptime(member_since, "%Y-%m-%d")
+                return parse_date(member_since)
         except Exception as e:
             logger.error(f"Error fetching profile: {e}")
 
@@ -355,7 +805,7 @@ class FitbitCollector:
         Returns:
             Intraday dataset with time-series data
         """
-        date_str = date.strftime("%Y-%m-%d")
+        date_str = _date_str(date)
         endpoint = f"/activities/{resource}/date/{date_str}/1d/{detail_level}.json"
 
         logger.debug(f"Fetching intraday {resource} for {date_str} at {detail_level}")
@@ -375,7 +825,7 @@ class FitbitCollector:
         Returns:
             Intraday heart rate dataset
         """
-        date_str = date.strftime("%Y-%m-%d")
+        date_str = _date_str(date)
         endpoint = f"/activities/heart/date/{date_str}/1d/{detail_level}.json"
 
         logger.debug(f"Fetching intraday heart rate for {date_str} at {detail_level}")
@@ -395,37 +845,26 @@ class FitbitCollector:
         if not Config.ENABLE_INTRADAY_COLLECTION:
             return {}
 
-        logger.info(f"Collecting intraday data for {date.strftime('%Y-%m-%d')}")
+        date_str = _date_str(date)
+        logger.info(f"Collecting intraday data for {date_str}")
 
         intraday_data = {
-            "date": date.strftime("%Y-%m-%d"),
+            "date": date_str,
             "timestamp": int(date.timestamp()),
             "resources": {},
         }
 
         # Collect activity resources
         for resource in Config.INTRADAY_RESOURCES:
+            fetch, args = self._intraday_dispatch[resource]
             try:
-                if resource == "heart_rate":
-                    dataset = self.get_intraday_heart_rate(date, Config.INTRADAY_HEART_RATE_DETAIL)
-                else:
-                    dataset = self.get_intraday_activity(
-                        date, resource, Config.INTRADAY_DETAIL_LEVEL
-                    )
-
-                intraday_data["resources"][resource] = dataset
-
-                # Rate limit delay between resources
-                time.sleep(5)  # Conservative 5-second delay
-
-            except RateLimitError:
-                # Re-raise rate limit errors to be handled by caller
+                intraday_data["resources"][resource] = fetch(date, *args)
+            except (RateLimitError, ShutdownRequested):
+                # Re-raise rate limit errors and shutdown to be handled by caller
                 raise
             except Exception as e:
                 # Log error but continue with other resources
-                logger.error(
-                    f"Error collecting intraday {resource} for {date.strftime('%Y-%m-%d')}: {e}"
-                )
+                logger.error(f"Error collecting intraday {resource} for {date_str}: {e}")
                 intraday_data["resources"][resource] = {}
 
         return intraday_data
@@ -439,19 +878,16 @@ class FitbitCollector:
         Returns:
             Sleep data with stages and metrics
         """
-        date_str = date.strftime("%Y-%m-%d")
+        date_str = _date_str(date)
 
         # Sleep API uses v1.2 instead of v1, so construct full URL manually
-        token = self.auth.get_valid_token()
-        headers = {"Authorization": f"Bearer {token}"}
         url = f"https://api.fitbit.com/1.2/user/-/sleep/date/{date_str}.json"
 
         logger.debug(f"Fetching sleep data for {date_str}")
 
         try:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            data = response.json()
+            response = self._get(url)
+            data = json_compat.loads(response.content)
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 429:
                 retry_after = int(e.response.headers.get("Retry-After", "60"))
@@ -477,7 +913,7 @@ class FitbitCollector:
         Returns:
             SpO2 data
         """
-        date_str = date.strftime("%Y-%m-%d")
+        date_str = _date_str(date)
         endpoint = f"/spo2/date/{date_str}.json"
 
         logger.debug(f"Fetching SpO2 data for {date_str}")
@@ -499,7 +935,7 @@ class FitbitCollector:
         Returns:
             Breathing rate data
         """
-        date_str = date.strftime("%Y-%m-%d")
+        date_str = _date_str(date)
         endpoint = f"/br/date/{date_str}.json"
 
         logger.debug(f"Fetching breathing rate for {date_str}")
@@ -521,7 +957,7 @@ class FitbitCollector:
         Returns:
             HRV data with RMSSD values
         """
-        date_str = date.strftime("%Y-%m-%d")
+        date_str = _date_str(date)
         endpoint = f"/hrv/date/{date_str}.json"
 
         logger.debug(f"Fetching HRV data for {date_str}")
@@ -543,7 +979,7 @@ class FitbitCollector:
         Returns:
             Cardio fitness score data
         """
-        date_str = date.strftime("%Y-%m-%d")
+        date_str = _date_str(date)
         endpoint = f"/cardioscore/date/{date_str}.json"
 
         logger.debug(f"Fetching cardio fitness score for {date_str}")
@@ -565,7 +1001,7 @@ class FitbitCollector:
         Returns:
             Temperature data
         """
-        date_str = date.strftime("%Y-%m-%d")
+        date_str = _date_str(date)
         endpoint = f"/temp/skin/date/{date_str}.json"
 
         logger.debug(f"Fetching temperature data for {date_str}")
@@ -0,0 +1,100 @@
+"""Client-side rate limiting for the Fitbit API."""
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Fitbit allows 150 requests per user per hour
+FITBIT_REQUESTS_PER_HOUR = 150
+
+
+class ShutdownRequested(Exception):
+    """Raised when a wait for the rate limit is cut short by shutdown."""
+
+
+class TokenBucket:
+    """Token bucket limiter that blocks only once the request budget is spent.
+
+    Requests proceed back-to-back while tokens remain; when the bucket is
+    empty, acquire() sleeps just long enough for the next token to refill.
+    """
+
+    def __init__(
+        self,
+        capacity: float = FITBIT_REQUESTS_PER_HOUR,
+        refill_rate: float = FITBIT_REQUESTS_PER_HOUR / 3600,
+        stop_event: threading.Event | None = None,
+    ):
+        """Initialize a full bucket.
+
+        Args:
+            capacity: Maximum number of tokens (burst size)
+            refill_rate: Tokens added per second
+            stop_event: Event set on shutdown to abandon waits for a token
+        """
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._stop_event = stop_event or threading.Event()
+
+    def _wait(self, seconds: float) -> bool:
+        """Wait for the given time unless shutdown is requested.
+
+        Args:
+            seconds: Time to wait
+
+        Returns:
+            True if woken early by a shutdown request
+        """
+        return self._stop_event.wait(seconds)
+
+    def _refill(self) -> None:
+        """Add tokens accrued since the last update, capped at capacity."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_rate)
+        self._updated = now
+
+    @property
+    def tokens(self) -> float:
+        """Number of tokens currently available."""
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def acquire(self) -> None:
+        """Take one token, waiting until one is available if necessary.
+
+        Raises:
+            ShutdownRequested: If shutdown is requested while waiting
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                sleep_for = (1 - self._tokens) / self.refill_rate
+                logger.info(f"Request budget spent, waiting {sleep_for:.1f}s for rate limit")
+                if self._wait(sleep_for):
+                    raise ShutdownRequested("Shutdown requested while waiting for rate limit")
+                self._refill()
+            self._tokens -= 1
+
+    def sync_from_headers(self, remaining: int, reset_seconds: float) -> None:
+        """Re-anchor the bucket to the quota reported by Fitbit.
+
+        Other clients (or a restart) may have used part of the hourly quota,
+        so the server's count wins over the local estimate.
+
+        Args:
+            remaining: Requests left in the current window (Fitbit-Rate-Limit-Remaining)
+            reset_seconds: Seconds until the window resets (Fitbit-Rate-Limit-Reset)
+        """
+        with self._lock:
+            self._refill()
+            if remaining > 0:
+                self._tokens = min(self._tokens, float(remaining))
+            else:
+                # Quota spent: the next token becomes available when the window resets
+                self._tokens = min(self._tokens, 1 - reset_seconds * self.refill_rate)
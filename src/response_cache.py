@@ -0,0 +1,188 @@
+"""Persistent cache for Fitbit API responses."""
+
+import hashlib
+import logging
+import re
+import shelve
+import threading
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from .date_utils import parse_date
+
+logger = logging.getLogger(__name__)
+
+# Data for recent days may still change as the device syncs
+SHORT_TTL_SECONDS = 10 * 60
+# Rarely changing resources such as the user profile
+LONG_TTL_SECONDS = 24 * 60 * 60
+# Days older than this are considered final and cached forever
+SETTLED_AFTER_DAYS = 2
+
+_LONG_TTL_ENDPOINTS = ("/profile.json",)
+_DATE_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+class ResponseCache:
+    """On-disk cache of API responses keyed by endpoint and query parameters.
+
+    Entries for settled dates never expire, so re-running a backfill skips
+    the network for days that were already fetched. Expired entries keep
+    their ETag/Last-Modified validators so refreshes can be conditional.
+    """
+
+    def __init__(self, cache_file: Path):
+        """Initialize cache.
+
+        Args:
+            cache_file: Path of the shelve database (opened on first use)
+        """
+        self.cache_file = cache_file
+        self._shelf: shelve.Shelf | None = None
+        # shelve is not safe for concurrent access from the collector's worker threads
+        self._lock = threading.Lock()
+
+    @property
+    def shelf(self) -> shelve.Shelf:
+        """Underlying shelve database, opened lazily."""
+        if self._shelf is None:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            self._shelf = shelve.open(str(self.cache_file))  # noqa: SIM115
+        return self._shelf
+
+    @staticmethod
+    def key(endpoint: str, params: dict | None = None) -> str:
+        """Build the cache key for a request.
+
+        Args:
+            endpoint: API endpoint path
+            params: Query parameters
+
+        Returns:
+            Hex digest identifying the request
+        """
+        query = "&".join(f"{k}={v}" for k, v in sorted((params or {}).items()))
+        return hashlib.sha1(f"{endpoint}?{query}".encode()).hexdigest()
+
+    @staticmethod
+    def ttl_for(endpoint: str, today: date | None = None) -> float | None:
+        """Get how long a response for an endpoint stays fresh.
+
+        Args:
+            endpoint: API endpoint path
+            today: Reference date (defaults to the current date)
+
+        Returns:
+            TTL in seconds, or None if the response never expires
+        """
+        if endpoint.endswith(_LONG_TTL_ENDPOINTS):
+            return LONG_TTL_SECONDS
+
+        dates = _DATE_PATTERN.findall(endpoint)
+        if dates:
+            today = today or datetime.now().date()
+            newest = max(parse_date(d).date() for d in dates)
+            if newest < today - timedelta(days=SETTLED_AFTER_DAYS):
+                return None
+
+        return SHORT_TTL_SECONDS
+
+    def get(self, key: str) -> dict | None:
+        """Get a cached entry.
+
+        Args:
+            key: Cache key from key()
+
+        Returns:
+            Entry with data, validators and storage time, or None
+        """
+        try:
+            with self._lock:
+                return self.shelf.get(key)
+        except Exception as e:
+            logger.warning(f"Error reading response cache: {e}")
+            return None
+
+    def is_fresh(self, entry: dict, endpoint: str) -> bool:
+        """Check whether a cached entry can be used without revalidating.
+
+        Args:
+            entry: Entry returned by get()
+            endpoint: API endpoint path the entry belongs to
+
+        Returns:
+            True if the entry has not expired
+        """
+        ttl = self.ttl_for(endpoint)
+        return ttl is None or time.time() - entry["stored_at"] < ttl
+
+    @staticmethod
+    def conditional_headers(entry: dict) -> dict:
+        """Build revalidation headers from a cached entry's validators.
+
+        Args:
+            entry: Entry returned by get()
+
+        Returns:
+            If-None-Match / If-Modified-Since headers (may be empty)
+        """
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def set(self, key: str, data: dict | list, headers: dict | None = None) -> None:
+        """Store a response.
+
+        Args:
+            key: Cache key from key()
+            data: Decoded response body
+            headers: Response headers (ETag/Last-Modified are kept)
+        """
+        headers = headers or {}
+        entry = {
+            "data": data,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "stored_at": time.time(),
+        }
+        try:
+            with self._lock:
+                self.shelf[key] = entry
+        except Exception as e:
+            logger.warning(f"Error writing response cache: {e}")
+
+    def set_not_found(self, key: str) -> None:
+        """Remember that a request returned HTTP 404 (no data for that date).
+
+        Args:
+            key: Cache key from key()
+        """
+        try:
+            with self._lock:
+                self.shelf[key] = {"data": None, "not_found": True, "stored_at": time.time()}
+        except Exception as e:
+            logger.warning(f"Error writing response cache: {e}")
+
+    def touch(self, key: str, entry: dict) -> None:
+        """Mark a revalidated (HTTP 304) entry as fresh again.
+
+        Args:
+            key: Cache key from key()
+            entry: Entry returned by get()
+        """
+        try:
+            with self._lock:
+                self.shelf[key] = {**entry, "stored_at": time.time()}
+        except Exception as e:
+            logger.warning(f"Error writing response cache: {e}")
+
+    def close(self) -> None:
+        """Flush and close the underlying database."""
+        with self._lock:
+            if self._shelf is not None:
+                self._shelf.close()
+                self._shelf = None
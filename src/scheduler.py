@@ -1,45 +1,183 @@
 """Scheduler for periodic data synchronization."""
 
+import atexit
 import logging
+import random
+import signal
+import threading
 import time
-from datetime import datetime, timedelta
+from collections.abc import Callable
+from concurrent import futures
+from datetime import date, datetime, timedelta
 
+from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.schedulers.blocking import BlockingScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 
 from .config import Config
+from .date_utils import parse_date
 from .fitbit_auth import FitbitAuth
 from .fitbit_collector import FitbitCollector, RateLimitError
+from .rate_limiter import ShutdownRequested
+from .response_cache import ResponseCache
 from .sync_state import SyncState
 from .victoria_writer import VictoriaMetricsWriter
 
 logger = logging.getLogger(__name__)
 
 
+def _is_quota_exhausted(e: RateLimitError) -> bool:
+    """Check whether a rate limit error reports the hourly quota as used up.
+
+    Args:
+        e: Rate limit error from the collector
+
+    Returns:
+        True if Fitbit reported no remaining requests
+    """
+    return e.remaining is not None and e.remaining <= 0
+
+
+def _wait_for(e: RateLimitError, default: int = 60) -> int:
+    """Get the server-requested wait for a rate limit error.
+
+    Args:
+        e: Rate limit error from the collector
+        default: Seconds to wait if Fitbit sent no Retry-After
+
+    Returns:
+        Seconds to wait before retrying
+    """
+    return e.retry_after or default
+
+
+def _midnight(day: date) -> datetime:
+    """Get the start of a calendar day as the datetime the collector expects.
+
+    Args:
+        day: Calendar day
+
+    Returns:
+        Datetime at 00:00 local time on that day
+    """
+    return datetime.combine(day, datetime.min.time())
+
+
+# Yesterday is complete but late device syncs can still change it; re-fetch at most this often
+YESTERDAY_RESYNC_SECONDS = 3600
+
+# A backfill batch is written once it holds this many days or is this old. Cached
+# days fetch instantly and fill batches by size; quota-paced days hit the age limit,
+# which bounds how much fetched data a crash can lose. The writer splits large
+# batches into Config.VM_BATCH_POINTS-sized requests.
+BACKFILL_BATCH_MAX_DAYS = 100
+BACKFILL_BATCH_MAX_SECONDS = 600
+
+# Quiet time after the startup backfill before more requests, to avoid immediate rate limiting
+BACKFILL_COOLDOWN_SECONDS = 60
+
+# OS-seeded so replicas sharing a quota don't back off in lockstep
+_random = random.SystemRandom()
+
+
+def _backoff_sleep(
+    attempt: int,
+    retry_after: float | None = None,
+    base: float = 1.0,
+    cap: float = 30.0,
+    jitter: float = 0.5,
+    sleep: Callable[[float], object] | None = None,
+) -> float:
+    """Sleep with capped exponential backoff and jitter.
+
+    Args:
+        attempt: Retry attempt number (1 for the first retry)
+        retry_after: Server-requested wait, used as a lower bound if present
+        base: Delay for attempt 0 in seconds
+        cap: Maximum backoff before jitter in seconds
+        jitter: Fraction by which the delay is randomly varied up or down
+        sleep: Function used to wait (defaults to time.sleep)
+
+    Returns:
+        Seconds slept
+    """
+    delay = min(cap, base * 2**attempt) * (1 + _random.uniform(-jitter, jitter))
+    if retry_after:
+        delay = max(delay, retry_after)
+    logger.info(f"Backing off for {delay:.1f} seconds (attempt {attempt})")
+    (sleep or time.sleep)(delay)
+    return delay
+
+
 class SyncScheduler:
     """Schedules and manages periodic Fitbit data synchronization."""
 
     def __init__(self):
         """Initialize scheduler."""
+        # Set on SIGTERM so long rate limit waits end immediately, including the
+        # collector's token bucket and retry backoff
+        self._stop_event = threading.Event()
         self.auth = FitbitAuth()
-        self.collector = FitbitCollector(self.auth)
+        cache = ResponseCache(Config.CACHE_FILE) if Config.ENABLE_RESPONSE_CACHE else None
+        self.collector = FitbitCollector(self.auth, cache=cache, stop_event=self._stop_event)
         self.writer = VictoriaMetricsWriter()
         self.state = SyncState(Config.STATE_FILE)
-        self.scheduler = BlockingScheduler()
+        # Background writer for backfill batches (one at a time keeps state ordered)
+        self._write_executor = futures.ThreadPoolExecutor(max_workers=1)
+        # The combined sync job runs on an executor worker thread, so a long run (e.g.
+        # filling a gap) never blocks the main thread, which only schedules
+        self.scheduler = BlockingScheduler(
+            executors={"default": ThreadPoolExecutor(max_workers=4)},
+            job_defaults={"max_instances": 1, "coalesce": True, "misfire_grace_time": 300},
+        )
+        # (date, monotonic time) of the last successful write of yesterday's data
+        self._last_yesterday_sync: tuple[date, float] | None = None
+
+    def _sleep(self, seconds: float) -> bool:
+        """Wait for the given time unless shutdown is requested.
+
+        Args:
+            seconds: Time to wait
+
+        Returns:
+            True if woken early by a shutdown request
+        """
+        return self._stop_event.wait(seconds)
+
+    def _cooldown_seconds(self) -> float:
+        """Get how much of the post-backfill cooldown is still left.
+
+        Time spent since the last Fitbit request counts towards the cooldown,
+        so nothing is waited when the backfill made no recent requests.
+
+        Returns:
+            Seconds to wait before the next round of requests
+        """
+        return max(0.0, BACKFILL_COOLDOWN_SECONDS - self.collector.seconds_since_last_request())
+
+    def _handle_shutdown(self, signum: int, frame) -> None:
+        """Stop pending waits and the scheduler on SIGTERM."""
+        logger.info(f"Received signal {signum}, shutting down...")
+        self._stop_event.set()
+        if self.scheduler.running:
+            self.scheduler.shutdown(wait=False)
 
     def sync_data(self) -> None:
         """Perform data synchronization."""
         logger.info("Starting data synchronization...")
 
+        # Snapshot the clock once so every check in this run agrees on "today"
+        now = datetime.now()
+        yesterday = now - timedelta(days=1)
+
         # Check if there's a gap that needs backfilling first
         last_synced = self.state.get_last_successful_date()
-        yesterday = datetime.now() - timedelta(days=1)
 
         if last_synced:
-            last_sync_date = datetime.strptime(last_synced, "%Y-%m-%d")
+            last_sync_date = parse_date(last_synced).date()
             # If there's a gap (last sync is before yesterday), trigger backfill
-            if last_sync_date < yesterday.replace(hour=0, minute=0, second=0, microsecond=0):
-                gap_days = (yesterday - last_sync_date).days
+            if last_sync_date < yesterday.date():
+                gap_days = (yesterday.date() - last_sync_date).days
                 logger.warning(
                     f"Gap detected: last_successful_date={last_synced}, yesterday={yesterday.strftime('%Y-%m-%d')}. "
                     f"Missing {gap_days} days. Triggering backfill to fill gap..."
@@ -49,10 +187,7 @@ class SyncScheduler:
                 # After backfill, reload state to check if gap is filled
                 last_synced = self.state.get_last_successful_date()
                 if last_synced:
-                    last_sync_date = datetime.strptime(last_synced, "%Y-%m-%d")
-                    if last_sync_date < yesterday.replace(
-                        hour=0, minute=0, second=0, microsecond=0
-                    ):
+                    if parse_date(last_synced).date() < yesterday.date():
                         # Gap still exists, skip state updates
                         skip_state_update = True
                         logger.info(
@@ -73,50 +208,57 @@ class SyncScheduler:
         # Collect device info once per sync cycle
         if Config.COLLECT_DEVICE_INFO:
             try:
-                device_info = self.collector.get_device_info()
+                device_info = self.state.get_cached_device_info(Config.DEVICE_INFO_TTL_SECONDS)
+                if device_info:
+                    logger.debug("Using cached device information")
+                else:
+                    device_info = self.collector.get_device_info()
+                    if device_info:
+                        self.state.update_device_info(device_info)
                 if device_info:
                     success = self.writer.write_device_info(device_info)
                     if success:
                         logger.info("Successfully synced device information")
             except RateLimitError as e:
                 # Check if quota is exhausted (remaining <= 0)
-                quota_exhausted = (
-                    hasattr(e, "remaining") and e.remaining is not None and e.remaining <= 0
-                )
+                quota_exhausted = _is_quota_exhausted(e)
 
                 if quota_exhausted:
                     # Don't wait if quota is exhausted - fail fast and let next scheduled run retry
-                    reset_time = (
-                        e.quota_reset if hasattr(e, "quota_reset") and e.quota_reset else "unknown"
-                    )
+                    reset_time = e.quota_reset or "unknown"
                     logger.warning(
                         f"Quota exhausted while collecting device info (remaining={e.remaining}, "
                         f"resets in {reset_time}s). Skipping device info collection this cycle."
                     )
                 else:
-                    # Transient rate limit - wait and continue
-                    wait_time = e.retry_after if hasattr(e, "retry_after") and e.retry_after else 60
-                    logger.warning(
-                        f"Rate limited while collecting device info, waiting {wait_time} seconds..."
-                    )
-                    time.sleep(wait_time)
+                    # Transient rate limit - back off and continue
+                    logger.warning("Rate limited while collecting device info, backing off...")
+                    _backoff_sleep(1, e.retry_after, sleep=self._sleep)
             except Exception as e:
                 logger.error(f"Error syncing device info: {e}")
 
         # Determine which dates to sync
-        dates_to_sync = [datetime.now() - timedelta(days=1)]  # Yesterday (complete data)
+        dates_to_sync = []
+        last_yesterday_sync = self._last_yesterday_sync
+        if (
+            last_yesterday_sync
+            and last_yesterday_sync[0] == yesterday.date()
+            and time.monotonic() - last_yesterday_sync[1] < YESTERDAY_RESYNC_SECONDS
+        ):
+            logger.debug(f"Skipping {yesterday.strftime('%Y-%m-%d')}, synced recently")
+        else:
+            dates_to_sync.append(yesterday)  # Yesterday (complete data)
 
         if Config.INCLUDE_TODAY_DATA:
-            dates_to_sync.append(datetime.now())  # Today (incomplete but current)
+            dates_to_sync.append(now)  # Today (incomplete but current)
 
         max_retries = 2
         for target_date in dates_to_sync:
             retry_count = 0
-            is_complete_day = (
-                target_date.date() < datetime.now().date()
-            )  # Only yesterday or earlier is complete
+            is_complete_day = target_date.date() < now.date()  # Only yesterday or earlier
+            date_str = target_date.strftime("%Y-%m-%d")
 
-            while retry_count <= max_retries:
+            while retry_count <= max_retries and not self._stop_event.is_set():
                 try:
                     # Collect data
                     data = self.collector.get_daily_data(target_date)
@@ -125,6 +267,8 @@ class SyncScheduler:
                     success = self.writer.write_daily_data(data)
 
                     if success:
+                        if is_complete_day:
+                            self._last_yesterday_sync = (target_date.date(), time.monotonic())
                         # Only update state for complete days (yesterday or earlier)
                         # AND only if there's no gap
                         if is_complete_day and not skip_state_update:
@@ -146,19 +290,13 @@ class SyncScheduler:
 
                 except RateLimitError as e:
                     # Check if quota is exhausted (remaining <= 0)
-                    quota_exhausted = (
-                        hasattr(e, "remaining") and e.remaining is not None and e.remaining <= 0
-                    )
+                    quota_exhausted = _is_quota_exhausted(e)
 
                     if quota_exhausted:
                         # Quota exhausted - fail fast, don't retry
-                        reset_time = (
-                            e.quota_reset
-                            if hasattr(e, "quota_reset") and e.quota_reset
-                            else "unknown"
-                        )
+                        reset_time = e.quota_reset or "unknown"
                         logger.warning(
-                            f"Quota exhausted during sync for {target_date.strftime('%Y-%m-%d')} "
+                            f"Quota exhausted during sync for {date_str} "
                             f"(remaining={e.remaining}, resets in {reset_time}s). "
                             f"Skipping this sync cycle - will retry in next scheduled run."
                         )
@@ -168,21 +306,24 @@ class SyncScheduler:
                     retry_count += 1
                     if retry_count > max_retries:
                         logger.error(
-                            f"Failed to sync {target_date.strftime('%Y-%m-%d')} "
+                            f"Failed to sync {date_str} "
                             f"after {max_retries} retries due to rate limiting"
                         )
                         break
 
-                    wait_time = e.retry_after if hasattr(e, "retry_after") and e.retry_after else 60
                     logger.warning(
                         f"Rate limited during sync (retry {retry_count}/{max_retries}), "
-                        f"waiting {wait_time} seconds..."
+                        f"backing off..."
                     )
-                    time.sleep(wait_time)
+                    _backoff_sleep(retry_count, e.retry_after, sleep=self._sleep)
+
+                except ShutdownRequested:
+                    logger.info(f"Shutdown requested, stopping sync for {date_str}")
+                    break
 
                 except Exception as e:
                     logger.error(
-                        f"Error during sync for {target_date.strftime('%Y-%m-%d')}: {e}",
+                        f"Error during sync for {date_str}: {e}",
                         exc_info=True,
                     )
                     break
@@ -196,22 +337,22 @@ class SyncScheduler:
             last_synced = self.state.get_last_successful_date()
 
             # End at yesterday (most recent complete day)
-            end_date = datetime.now() - timedelta(days=1)
+            end_date = date.today() - timedelta(days=1)
 
             if last_synced:
                 # Check if we need to fill a gap (app was down)
-                last_sync_date = datetime.strptime(last_synced, "%Y-%m-%d")
+                last_sync_date = parse_date(last_synced).date()
 
                 # If last sync was yesterday or today, no gap to fill
                 if last_sync_date >= end_date:
                     logger.info(f"Last sync ({last_synced}) is current, no gap to fill")
                     # Still check for historical backfill if configured
                     if Config.BACKFILL_START_DATE:
-                        start_date = datetime.strptime(Config.BACKFILL_START_DATE, "%Y-%m-%d")
+                        start_date = parse_date(Config.BACKFILL_START_DATE).date()
                         if start_date < last_sync_date:
                             logger.info(
-                                f"Starting historical backfill from {start_date.strftime('%Y-%m-%d')} "
-                                f"to {(last_sync_date - timedelta(days=1)).strftime('%Y-%m-%d')}"
+                                f"Starting historical backfill from {start_date.isoformat()} "
+                                f"to {(last_sync_date - timedelta(days=1)).isoformat()}"
                             )
                             self._backfill_with_incremental_sync(
                                 start_date, last_sync_date - timedelta(days=1)
@@ -222,33 +363,26 @@ class SyncScheduler:
                 start_date = last_sync_date + timedelta(days=1)
                 logger.info(
                     f"Gap detected: last sync was {last_synced}, filling gap from "
-                    f"{start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}"
+                    f"{start_date.isoformat()} to {end_date.isoformat()}"
                 )
             elif Config.BACKFILL_START_DATE:
                 # Use configured backfill start date
-                start_date = datetime.strptime(Config.BACKFILL_START_DATE, "%Y-%m-%d")
-                logger.info(
-                    f"Starting backfill from configured date {start_date.strftime('%Y-%m-%d')}"
-                )
+                start_date = parse_date(Config.BACKFILL_START_DATE).date()
+                logger.info(f"Starting backfill from configured date {start_date.isoformat()}")
             else:
                 # Get first available date from Fitbit
                 first_date = self.collector.get_first_available_date()
                 if not first_date:
                     logger.warning("Could not determine first available date")
                     return
-                start_date = first_date
-                logger.info(
-                    f"Starting backfill from first available date {start_date.strftime('%Y-%m-%d')}"
-                )
+                start_date = first_date.date()
+                logger.info(f"Starting backfill from first available date {start_date.isoformat()}")
 
             if start_date > end_date:
                 logger.info("No data to backfill")
                 return
 
-            logger.info(
-                f"Backfilling data from {start_date.strftime('%Y-%m-%d')} "
-                f"to {end_date.strftime('%Y-%m-%d')}"
-            )
+            logger.info(f"Backfilling data from {start_date.isoformat()} to {end_date.isoformat()}")
 
             # Fetch and sync data incrementally with batching
             self._backfill_with_incremental_sync(start_date, end_date)
@@ -256,7 +390,7 @@ class SyncScheduler:
         except Exception as e:
             logger.error(f"Error during backfill: {e}", exc_info=True)
 
-    def _backfill_with_incremental_sync(self, start_date: datetime, end_date: datetime) -> None:
+    def _backfill_with_incremental_sync(self, start_date: date, end_date: date) -> None:
         """Backfill data with incremental syncing to Victoria Metrics.
 
         Fetches data in batches and writes to Victoria Metrics incrementally.
@@ -266,156 +400,134 @@ class SyncScheduler:
             start_date: Start date for backfill
             end_date: End date for backfill
         """
-        batch_size = 10  # Write to Victoria Metrics every N days
         batch = []
+        batch_started = 0.0
         total_successful = 0
         total_failed = 0
+        # Full batches are written in the background while the next day is fetched;
+        # at most one write is outstanding so state updates stay in order
+        pending_write: tuple[futures.Future, str] | None = None
+
+        def finish_pending_write() -> None:
+            nonlocal pending_write, total_successful, total_failed
+            if pending_write is None:
+                return
+            future, last_date = pending_write
+            pending_write = None
+            try:
+                successful, failed = future.result()
+            except Exception as e:
+                logger.error(f"Error writing batch ending {last_date}: {e}")
+                return
+            total_successful += successful
+            total_failed += failed
+            # Debounced: progress is flushed below, on errors and at the end of the run
+            self.state.update_last_sync_memory(last_date)
+            logger.info(f"Synced batch: {successful} days written, progress: {last_date}")
+
+        def write_batch() -> None:
+            # Write the partial batch now, before waiting on a rate limit or skipping a day
+            nonlocal batch, total_successful, total_failed
+            finish_pending_write()
+            self.state.flush()
+            if not batch:
+                return
+            logger.info(f"Writing partial batch of {len(batch)} days...")
+            successful, failed = self.writer.write_multiple_days(batch)
+            total_successful += successful
+            total_failed += failed
+            self.state.update_last_sync(batch[-1]["date"])
+            batch = []
+
         current_date = start_date
         consecutive_rate_limits = 0
         max_consecutive_rate_limits = 3
 
         while current_date <= end_date:
+            if self._stop_event.is_set():
+                logger.info("Shutdown requested, stopping backfill")
+                break
+
+            date_str = current_date.isoformat()
             try:
                 # Fetch one day's data
-                daily_data = self.collector.get_daily_data(current_date)
+                daily_data = self.collector.get_daily_data(_midnight(current_date))
+                if not batch:
+                    batch_started = time.monotonic()
                 batch.append(daily_data)
                 consecutive_rate_limits = 0  # Reset on success
 
-                # Write batch when full or at end
-                if len(batch) >= batch_size or current_date == end_date:
-                    successful, failed = self.writer.write_multiple_days(batch)
-                    total_successful += successful
-                    total_failed += failed
-
-                    if batch:
-                        # Update state to last successfully written date
-                        self.state.update_last_sync(batch[-1]["date"])
-                        logger.info(
-                            f"Synced batch: {successful} days written, "
-                            f"progress: {batch[-1]['date']}"
-                        )
-
+                # Write batch when full, old or at end (in the background)
+                if (
+                    len(batch) >= BACKFILL_BATCH_MAX_DAYS
+                    or time.monotonic() - batch_started >= BACKFILL_BATCH_MAX_SECONDS
+                    or current_date == end_date
+                ):
+                    finish_pending_write()
+                    pending_write = (
+                        self._write_executor.submit(self.writer.write_multiple_days, batch),
+                        batch[-1]["date"],
+                    )
                     batch = []  # Clear batch
 
                 # Move to next date
                 current_date += timedelta(days=1)
 
-                # Rate limit compliance: wait 30 seconds between requests
+                # Rate limit compliance: spread the remaining quota until it resets
                 if current_date <= end_date:
-                    time.sleep(30)
+                    self._sleep(self.collector.get_pacing_delay())
 
             except RateLimitError as e:
                 consecutive_rate_limits += 1
                 logger.warning(
-                    f"Rate limited on {current_date.strftime('%Y-%m-%d')} "
+                    f"Rate limited on {date_str} "
                     f"({consecutive_rate_limits}/{max_consecutive_rate_limits})"
                 )
+                write_batch()
 
-                # Write partial batch before handling error
-                if batch:
-                    logger.info(
-                        f"Writing partial batch of {len(batch)} days before rate limit wait..."
+                if consecutive_rate_limits > max_consecutive_rate_limits:
+                    # The final retry after the extended wait was rate limited too
+                    logger.error(
+                        f"Still rate limited after extended wait. Stopping backfill. "
+                        f"Progress saved at {self.state.get_last_successful_date()}. "
+                        f"Will resume on next run."
                     )
-                    successful, failed = self.writer.write_multiple_days(batch)
-                    total_successful += successful
-                    total_failed += failed
-
-                    if batch:
-                        self.state.update_last_sync(batch[-1]["date"])
-
-                    batch = []
+                    break
 
-                # Determine wait time based on quota status
-                base_wait_time = (
-                    e.retry_after if hasattr(e, "retry_after") and e.retry_after else 60
-                )
+                if consecutive_rate_limits < max_consecutive_rate_limits:
+                    logger.info("Backing off before retrying...")
+                    _backoff_sleep(consecutive_rate_limits, _wait_for(e), sleep=self._sleep)
+                    continue  # Retry the same date
 
-                # Check if we should stop due to persistent rate limiting
-                if consecutive_rate_limits >= max_consecutive_rate_limits:
-                    # Check if quota is exhausted (remaining <= 0)
-                    quota_exhausted = (
-                        hasattr(e, "remaining") and e.remaining is not None and e.remaining <= 0
+                if _is_quota_exhausted(e) and e.quota_reset:
+                    # Use the exact quota reset time from API
+                    wait_time = e.quota_reset
+                    logger.warning(
+                        f"Hit {consecutive_rate_limits} consecutive rate limits. "
+                        f"Quota exhausted (remaining={e.remaining}). "
+                        f"Waiting {wait_time}s until quota resets..."
+                    )
+                else:
+                    # Fall back to extended wait if no quota info available
+                    wait_time = 300
+                    logger.warning(
+                        f"Hit {consecutive_rate_limits} consecutive rate limits. "
+                        f"Waiting {wait_time}s before final retry..."
                     )
 
-                    if quota_exhausted and hasattr(e, "quota_reset") and e.quota_reset:
-                        # Use the exact quota reset time from API
-                        wait_time = e.quota_reset
-                        logger.warning(
-                            f"Hit {consecutive_rate_limits} consecutive rate limits. "
-                            f"Quota exhausted (remaining={e.remaining}). "
-                            f"Waiting {wait_time}s until quota resets..."
-                        )
-                    else:
-                        # Fall back to extended wait if no quota info available
-                        wait_time = 300
-                        logger.warning(
-                            f"Hit {consecutive_rate_limits} consecutive rate limits. "
-                            f"Waiting {wait_time}s before final retry..."
-                        )
-
-                    time.sleep(wait_time)
-
-                    # Try one final time after extended wait
-                    try:
-                        logger.info(
-                            f"Final retry for {current_date.strftime('%Y-%m-%d')} after extended wait"
-                        )
-                        daily_data = self.collector.get_daily_data(current_date)
-                        batch.append(daily_data)
-                        consecutive_rate_limits = 0  # Reset on success
-
-                        # Write batch if needed
-                        if len(batch) >= batch_size or current_date == end_date:
-                            successful, failed = self.writer.write_multiple_days(batch)
-                            total_successful += successful
-                            total_failed += failed
-                            if batch:
-                                self.state.update_last_sync(batch[-1]["date"])
-                                logger.info(
-                                    f"Synced batch after extended wait: progress={batch[-1]['date']}"
-                                )
-                            batch = []
-
-                        # Move to next date
-                        current_date += timedelta(days=1)
-                        if current_date <= end_date:
-                            time.sleep(30)  # Rate limit delay
-
-                    except RateLimitError:
-                        logger.error(
-                            f"Still rate limited after {wait_time}s wait. "
-                            f"Stopping backfill. Progress saved at {self.state.get_last_successful_date()}. "
-                            f"Will resume on next run."
-                        )
-                        break
-                    except Exception as e:
-                        logger.error(f"Error on final retry: {e}")
-                        current_date += timedelta(days=1)
-
-                    continue  # Continue to next iteration
-
-                logger.info(f"Waiting {base_wait_time} seconds before retrying...")
-                time.sleep(base_wait_time)
-                # Don't increment date - retry the same date
+                if self._sleep(wait_time):
+                    break
+                logger.info(f"Final retry for {date_str} after extended wait")
 
             except Exception as e:
-                logger.error(f"Error fetching {current_date.strftime('%Y-%m-%d')}: {e}")
-
-                # Write partial batch before handling error
-                if batch:
-                    logger.info(f"Writing partial batch of {len(batch)} days before error...")
-                    successful, failed = self.writer.write_multiple_days(batch)
-                    total_successful += successful
-                    total_failed += failed
-
-                    if batch:
-                        self.state.update_last_sync(batch[-1]["date"])
-
-                    batch = []
+                logger.error(f"Error fetching {date_str}: {e}")
+                write_batch()
+                consecutive_rate_limits = 0
 
                 # Move to next date
                 current_date += timedelta(days=1)
 
+        write_batch()
         logger.info(f"Backfill complete: {total_successful} successful, {total_failed} failed")
 
     def backfill_intraday_data(self) -> None:
@@ -434,9 +546,7 @@ class SyncScheduler:
 
             if last_intraday_backfill:
                 # Continue from where we left off
-                start_date = datetime.strptime(last_intraday_backfill, "%Y-%m-%d") + timedelta(
-                    days=1
-                )
+                start_date = parse_date(last_intraday_backfill) + timedelta(days=1)
                 logger.info(
                     f"Resuming intraday backfill from {start_date.strftime('%Y-%m-%d')} "
                     f"(last completed: {last_intraday_backfill})"
@@ -450,7 +560,7 @@ class SyncScheduler:
                 )
             elif Config.BACKFILL_START_DATE:
                 # Use same start date as daily backfill
-                start_date = datetime.strptime(Config.BACKFILL_START_DATE, "%Y-%m-%d")
+                start_date = parse_date(Config.BACKFILL_START_DATE)
                 logger.info(
                     f"Starting intraday backfill from configured date {start_date.strftime('%Y-%m-%d')}"
                 )
@@ -492,9 +602,14 @@ class SyncScheduler:
         max_consecutive_rate_limits = 3
 
         while current_date <= end_date:
+            if self._stop_event.is_set():
+                logger.info("Shutdown requested, stopping intraday backfill")
+                break
+
+            date_str = current_date.strftime("%Y-%m-%d")
             try:
                 # Fetch intraday data for one day
-                logger.info(f"Backfilling intraday data for {current_date.strftime('%Y-%m-%d')}")
+                logger.info(f"Backfilling intraday data for {date_str}")
                 intraday_data = self.collector.get_intraday_data(current_date)
 
                 if intraday_data and intraday_data.get("resources"):
@@ -504,52 +619,41 @@ class SyncScheduler:
                     if success:
                         total_successful += 1
                         # Update state to track progress
-                        self.state.update_intraday_backfill(intraday_data["date"])
+                        self.state.update_intraday_backfill_memory(intraday_data["date"])
                         logger.info(
                             f"Successfully backfilled intraday data for {intraday_data['date']}"
                         )
                     else:
                         total_failed += 1
-                        logger.error(
-                            f"Failed to write intraday data for {current_date.strftime('%Y-%m-%d')}"
-                        )
+                        logger.error(f"Failed to write intraday data for {date_str}")
                 else:
-                    logger.info(
-                        f"No intraday data available for {current_date.strftime('%Y-%m-%d')}"
-                    )
+                    logger.info(f"No intraday data available for {date_str}")
                     # Still update state to avoid re-processing
-                    self.state.update_intraday_backfill(current_date.strftime("%Y-%m-%d"))
+                    self.state.update_intraday_backfill_memory(date_str)
 
                 consecutive_rate_limits = 0  # Reset on success
 
                 # Move to next date
                 current_date += timedelta(days=1)
 
-                # Rate limit compliance: wait 30 seconds between requests
-                # Intraday data uses ~4 API calls per day (one per resource)
+                # Rate limit compliance: spread the remaining quota until it resets
                 if current_date <= end_date:
-                    time.sleep(30)
+                    self._sleep(self.collector.get_pacing_delay())
 
             except RateLimitError as e:
+                self.state.flush()
                 consecutive_rate_limits += 1
                 logger.warning(
-                    f"Rate limited on intraday {current_date.strftime('%Y-%m-%d')} "
+                    f"Rate limited on intraday {date_str} "
                     f"({consecutive_rate_limits}/{max_consecutive_rate_limits})"
                 )
 
-                # Determine wait time based on quota status
-                base_wait_time = (
-                    e.retry_after if hasattr(e, "retry_after") and e.retry_after else 60
-                )
-
                 # Check if we should stop due to persistent rate limiting
                 if consecutive_rate_limits >= max_consecutive_rate_limits:
                     # Check if quota is exhausted
-                    quota_exhausted = (
-                        hasattr(e, "remaining") and e.remaining is not None and e.remaining <= 0
-                    )
+                    quota_exhausted = _is_quota_exhausted(e)
 
-                    if quota_exhausted and hasattr(e, "quota_reset") and e.quota_reset:
+                    if quota_exhausted and e.quota_reset:
                         # Use exact quota reset time from API
                         wait_time = e.quota_reset
                         logger.warning(
@@ -565,33 +669,32 @@ class SyncScheduler:
                             f"Waiting {wait_time}s before final retry..."
                         )
 
-                    time.sleep(wait_time)
+                    if self._sleep(wait_time):
+                        break
 
                     # Try one final time after extended wait
                     try:
-                        logger.info(
-                            f"Final retry for intraday {current_date.strftime('%Y-%m-%d')} after extended wait"
-                        )
+                        logger.info(f"Final retry for intraday {date_str} after extended wait")
                         intraday_data = self.collector.get_intraday_data(current_date)
 
                         if intraday_data and intraday_data.get("resources"):
                             success = self.writer.write_intraday_data(intraday_data)
                             if success:
                                 total_successful += 1
-                                self.state.update_intraday_backfill(intraday_data["date"])
+                                self.state.update_intraday_backfill_memory(intraday_data["date"])
                                 logger.info(
                                     f"Successfully backfilled intraday after extended wait: {intraday_data['date']}"
                                 )
                             else:
                                 total_failed += 1
                         else:
-                            self.state.update_intraday_backfill(current_date.strftime("%Y-%m-%d"))
+                            self.state.update_intraday_backfill_memory(date_str)
 
                         consecutive_rate_limits = 0  # Reset on success
                         current_date += timedelta(days=1)
 
                         if current_date <= end_date:
-                            time.sleep(30)  # Rate limit delay
+                            self._sleep(self.collector.get_pacing_delay())
 
                     except RateLimitError:
                         logger.error(
@@ -606,18 +709,17 @@ class SyncScheduler:
 
                     continue  # Continue to next iteration
 
-                logger.info(f"Waiting {base_wait_time} seconds before retrying...")
-                time.sleep(base_wait_time)
+                logger.info("Backing off before retrying...")
+                _backoff_sleep(consecutive_rate_limits, _wait_for(e), sleep=self._sleep)
                 # Don't increment date - retry the same date
 
             except Exception as e:
-                logger.error(
-                    f"Error fetching intraday for {current_date.strftime('%Y-%m-%d')}: {e}"
-                )
+                logger.error(f"Error fetching intraday for {date_str}: {e}")
                 total_failed += 1
                 # Move to next date to avoid getting stuck
                 current_date += timedelta(days=1)
 
+        self.state.flush()
         logger.info(
             f"Intraday backfill complete: {total_successful} successful, {total_failed} failed"
         )
@@ -649,13 +751,23 @@ class SyncScheduler:
                 logger.error("Failed to write intraday data to Victoria Metrics")
 
         except RateLimitError as e:
-            wait_time = e.retry_after if hasattr(e, "retry_after") else 60
+            wait_time = _wait_for(e)
             logger.warning(f"Rate limited during intraday sync, waiting {wait_time}s")
-            time.sleep(wait_time)
+            self._sleep(wait_time)
 
         except Exception as e:
             logger.error(f"Error during intraday sync: {e}", exc_info=True)
 
+    def sync_all(self) -> None:
+        """Perform daily and then intraday synchronization as one scheduled job.
+
+        Running them back to back (rather than as two jobs on the same interval)
+        keeps them from competing for the hourly quota at the same moment.
+        """
+        self.sync_data()
+        if not self._stop_event.is_set():
+            self.sync_intraday_data()
+
     def start(self) -> None:
         """Start the scheduler."""
         logger.info("Starting SyncBit scheduler...")
@@ -674,6 +786,10 @@ class SyncScheduler:
 
         logger.info("Victoria Metrics connection successful")
 
+        # Persist debounced backfill progress if the process exits mid-run
+        atexit.register(self.state.flush)
+        signal.signal(signal.SIGTERM, self._handle_shutdown)
+
         # Log configuration for diagnostics
         logger.info(f"DEBUG: ENABLE_INTRADAY_COLLECTION={Config.ENABLE_INTRADAY_COLLECTION}")
         logger.info(f"DEBUG: ENABLE_INTRADAY_BACKFILL={Config.ENABLE_INTRADAY_BACKFILL}")
@@ -685,8 +801,11 @@ class SyncScheduler:
 
         # Perform intraday backfill if enabled
         if Config.ENABLE_INTRADAY_COLLECTION and Config.ENABLE_INTRADAY_BACKFILL:
-            logger.info("Waiting 60 seconds before starting intraday backfill...")
-            time.sleep(60)
+            cooldown = self._cooldown_seconds()
+            if cooldown:
+                logger.info(f"Waiting {cooldown:.0f} seconds before starting intraday backfill...")
+                if self._sleep(cooldown):
+                    return
             self.backfill_intraday_data()
         else:
             logger.info(
@@ -694,35 +813,30 @@ class SyncScheduler:
                 f"ENABLE_INTRADAY_BACKFILL={Config.ENABLE_INTRADAY_BACKFILL}"
             )
 
-        # Wait a bit after backfill to avoid immediate rate limiting
-        logger.info("Waiting 60 seconds before starting regular sync...")
-        time.sleep(60)
-
-        # Perform immediate sync
-        self.sync_data()
+        if self._stop_event.is_set():
+            return
 
-        # Schedule periodic sync
+        # Schedule periodic sync; the first run waits out the backfill cooldown,
+        # with the scheduler loop idling in the meantime
         interval_minutes = Config.SYNC_INTERVAL_MINUTES
-        logger.info(f"Scheduling sync every {interval_minutes} minutes")
+        first_run_delay = self._cooldown_seconds()
+        logger.info(
+            f"Scheduling sync every {interval_minutes} minutes "
+            f"(first run in {first_run_delay:.0f} seconds)"
+        )
 
+        # Intraday sync (if enabled) runs in the same job, right after the daily sync
         self.scheduler.add_job(
-            self.sync_data,
+            self.sync_all,
             trigger=IntervalTrigger(minutes=interval_minutes),
             id="sync_job",
             name="Fitbit data sync",
             replace_existing=True,
+            next_run_time=datetime.now() + timedelta(seconds=first_run_delay),
+            # A run missed by more than one interval is superseded by the next one
+            misfire_grace_time=interval_minutes * 60,
         )
-
-        # Schedule intraday sync (if enabled)
         if Config.ENABLE_INTRADAY_COLLECTION:
-            logger.info(f"Scheduling intraday sync every {interval_minutes} minutes")
-            self.scheduler.add_job(
-                self.sync_intraday_data,
-                trigger=IntervalTrigger(minutes=interval_minutes),
-                id="sync_intraday_job",
-                name="Fitbit intraday data sync",
-                replace_existing=True,
-            )
             logger.info("Intraday data collection enabled")
 
         # Start scheduler (blocking)
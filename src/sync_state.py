@@ -1,12 +1,18 @@
 """Sync state management for tracking last sync timestamps."""
 
-import json
 import logging
+import os
+import time
 from datetime import datetime
 from pathlib import Path
 
+from . import json_compat
+
 logger = logging.getLogger(__name__)
 
+# Minimum time between state file writes for debounced progress updates
+FLUSH_INTERVAL_SECONDS = 60
+
 
 class SyncState:
     """Manages sync state to track what data has been synchronized."""
@@ -21,6 +27,11 @@ class SyncState:
         self.last_sync: datetime | None = None
         self.last_successful_date: str | None = None
         self.last_intraday_backfill_date: str | None = None
+        self.device_info: list[dict] | None = None
+        self.device_info_updated: float | None = None  # Unix timestamp
+        self._dirty = False
+        self._last_saved = time.monotonic()
+        self._parent_ready = False
 
         self._load_state()
 
@@ -28,14 +39,16 @@ class SyncState:
         """Load state from file."""
         if self.state_file.exists():
             try:
-                with open(self.state_file) as f:
-                    data = json.load(f)
+                with open(self.state_file, "rb") as f:
+                    data = json_compat.loads(f.read())
 
                 if data.get("last_sync"):
                     self.last_sync = datetime.fromisoformat(data["last_sync"])
 
                 self.last_successful_date = data.get("last_successful_date")
                 self.last_intraday_backfill_date = data.get("last_intraday_backfill_date")
+                self.device_info = data.get("device_info")
+                self.device_info_updated = data.get("device_info_updated")
 
                 logger.info(
                     f"Loaded sync state: last_sync={self.last_sync}, "
@@ -51,14 +64,25 @@ class SyncState:
             "last_sync": self.last_sync.isoformat() if self.last_sync else None,
             "last_successful_date": self.last_successful_date,
             "last_intraday_backfill_date": self.last_intraday_backfill_date,
+            "device_info": self.device_info,
+            "device_info_updated": self.device_info_updated,
         }
 
         try:
-            self.state_file.parent.mkdir(parents=True, exist_ok=True)
-
-            with open(self.state_file, "w") as f:
-                json.dump(data, f, indent=2)
-
+            # Ensure parent directory exists (only checked on first save)
+            if not self._parent_ready:
+                self.state_file.parent.mkdir(parents=True, exist_ok=True)
+                self._parent_ready = True
+
+            # Write to a temp file and atomically replace, so a crash mid-write
+            # can't leave a truncated state file behind
+            tmp_file = self.state_file.with_name(f"{self.state_file.name}.tmp")
+            with open(tmp_file, "wb") as f:
+                f.write(json_compat.dumps(data, indent=True))
+            os.replace(tmp_file, self.state_file)
+
+            self._dirty = False
+            self._last_saved = time.monotonic()
             logger.debug("Saved sync state")
         except Exception as e:
             logger.error(f"Error saving sync state: {e}")
@@ -74,6 +98,35 @@ class SyncState:
         self._save_state()
         logger.info(f"Updated sync state: {date_str}")
 
+    def update_last_sync_memory(self, date_str: str) -> None:
+        """Record sync progress, writing the state file at most once per interval.
+
+        Use during long backfills where losing a minute of progress is cheaper
+        than a disk write per batch. Call flush() to persist pending progress.
+
+        Args:
+            date_str: Date string in YYYY-MM-DD format
+        """
+        self.last_sync = datetime.now()
+        self.last_successful_date = date_str
+        self._save_debounced()
+        logger.debug(f"Updated sync progress: {date_str}")
+
+    def _save_debounced(self) -> None:
+        """Mark state as changed and save it if the flush interval has elapsed."""
+        self._dirty = True
+        if time.monotonic() - self._last_saved >= FLUSH_INTERVAL_SECONDS:
+            self._save_state()
+
+    def flush(self) -> None:
+        """Write pending progress from the *_memory() updates to disk."""
+        if self._dirty:
+            self._save_state()
+            logger.info(
+                f"Flushed sync state: last_successful_date={self.last_successful_date}, "
+                f"last_intraday_backfill_date={self.last_intraday_backfill_date}"
+            )
+
     def get_last_successful_date(self) -> str | None:
         """Get last successfully synced date.
 
@@ -92,6 +145,18 @@ class SyncState:
         self._save_state()
         logger.info(f"Updated intraday backfill state: {date_str}")
 
+    def update_intraday_backfill_memory(self, date_str: str) -> None:
+        """Record intraday backfill progress, writing the state file at most once per interval.
+
+        Call flush() to persist pending progress.
+
+        Args:
+            date_str: Date string in YYYY-MM-DD format
+        """
+        self.last_intraday_backfill_date = date_str
+        self._save_debounced()
+        logger.debug(f"Updated intraday backfill progress: {date_str}")
+
     def get_last_intraday_backfill_date(self) -> str | None:
         """Get last intraday backfill date.
 
@@ -99,3 +164,28 @@ class SyncState:
             Date string or None
         """
         return self.last_intraday_backfill_date
+
+    def update_device_info(self, device_info: list[dict]) -> None:
+        """Cache device information fetched from Fitbit.
+
+        Args:
+            device_info: List of device information dictionaries
+        """
+        self.device_info = device_info
+        self.device_info_updated = time.time()
+        self._save_state()
+
+    def get_cached_device_info(self, max_age_seconds: float) -> list[dict] | None:
+        """Get cached device information if it is recent enough.
+
+        Args:
+            max_age_seconds: Maximum age of the cached information
+
+        Returns:
+            Cached device information, or None if missing or expired
+        """
+        if not self.device_info or self.device_info_updated is None:
+            return None
+        if time.time() - self.device_info_updated >= max_age_seconds:
+            return None
+        return self.device_info
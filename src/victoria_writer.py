@@ -1,26 +1,84 @@
 """Victoria Metrics writer for Fitbit data in Prometheus format."""
 
+import gzip
 import logging
+import os
+import threading
 from datetime import datetime
+from pathlib import Path
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+from .circuit_breaker import CircuitBreaker
 from .config import Config
+from .date_utils import parse_date
 
 logger = logging.getLogger(__name__)
 
+# Payloads smaller than this are sent uncompressed (gzip overhead outweighs the savings)
+GZIP_MIN_BYTES = 1024
+
+# Label values for Fitbit's standard heart rate zones; custom zones are normalized on the fly
+_ZONE_LABELS = {
+    "Out of Range": "out_of_range",
+    "Fat Burn": "fat_burn",
+    "Cardio": "cardio",
+    "Peak": "peak",
+}
+
+
+def _render_labels(labels: dict[str, str]) -> str:
+    """Render labels in sorted Prometheus form, e.g. 'device="charge6",user="me"'."""
+    return ",".join(f'{k}="{v}"' for k, v in sorted(labels.items()))
+
 
 class VictoriaMetricsWriter:
     """Writes metrics to Victoria Metrics in Prometheus format."""
 
-    def __init__(self):
-        """Initialize Victoria Metrics writer."""
+    def __init__(self, pending_file: Path | None = None):
+        """Initialize Victoria Metrics writer.
+
+        Args:
+            pending_file: Where to buffer metrics while Victoria Metrics is down
+                (defaults to Config.PENDING_WRITES_FILE)
+        """
         self.endpoint = Config.VICTORIA_ENDPOINT
         self.auth = (Config.VICTORIA_USER, Config.VICTORIA_PASSWORD)
         self.user_id = Config.get_fitbit_user_id()
+        # Labels on every metric, pre-rendered for the common no-extra-labels case
+        self._base_labels = {"user": self.user_id, "device": "charge6"}
+        self._base_label_str = _render_labels(self._base_labels)
+        self._label_cache: dict[tuple, str] = {}
+
+        # Keep the connection to Victoria Metrics alive across batch writes
+        self._session = requests.Session()
+        self._session.auth = self.auth
+        self._session.headers["Content-Type"] = "text/plain"
+        # Ride out brief proxy/restart errors; imports are idempotent (same timestamps)
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=4,
+            max_retries=Retry(
+                total=2,
+                read=0,
+                backoff_factor=0.5,
+                status_forcelist=(502, 503, 504),
+                allowed_methods=frozenset({"POST"}),
+                raise_on_status=False,
+            ),
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+        # Stop waiting on request timeouts while Victoria Metrics is down
+        self._breaker = CircuitBreaker("Victoria Metrics")
+        self.pending_file = pending_file or Config.PENDING_WRITES_FILE
+        self._pending_lock = threading.Lock()
 
     def _format_metric(
-        self, name: str, value: float, timestamp: int, labels: dict[str, str] = None
+        self, name: str, value: float, timestamp: int, labels: dict[str, str] | None = None
     ) -> str:
         """Format a single metric in Prometheus format.
 
@@ -33,24 +91,18 @@ class VictoriaMetricsWriter:
         Returns:
             Formatted metric line
         """
-        # Base labels
-        all_labels = {
-            "user": self.user_id,
-            "device": "charge6",
-        }
-
-        # Add custom labels
         if labels:
-            all_labels.update(labels)
-
-        # Format labels
-        label_str = ",".join([f'{k}="{v}"' for k, v in sorted(all_labels.items())])
-
-        # Convert timestamp to milliseconds for Prometheus
-        timestamp_ms = timestamp * 1000
-
-        # Format: metric_name{labels} value timestamp
-        return f"{name}{{{label_str}}} {value} {timestamp_ms}\n"
+            # Label sets repeat (zones, stages, devices), so each is rendered only once
+            key = tuple(labels.items())
+            label_str = self._label_cache.get(key)
+            if label_str is None:
+                label_str = _render_labels({**self._base_labels, **labels})
+                self._label_cache[key] = label_str
+        else:
+            label_str = self._base_label_str
+
+        # Format: metric_name{labels} value timestamp (milliseconds for Prometheus)
+        return f"{name}{{{label_str}}} {value} {timestamp * 1000}\n"
 
     def write_daily_data(self, data: dict) -> bool:
         """Write daily Fitbit data to Victoria Metrics.
@@ -61,17 +113,33 @@ class VictoriaMetricsWriter:
         Returns:
             True if successful
         """
+        return self._send_metrics(self._daily_metrics(data))
+
+    def _daily_metrics(self, data: dict) -> list[str]:
+        """Format daily Fitbit data as metric lines.
+
+        Args:
+            data: Daily data from Fitbit collector
+
+        Returns:
+            List of formatted metric lines
+        """
         timestamp = data["timestamp"]
         metrics = []
 
-        # Steps
-        metrics.append(self._format_metric("fitbit_steps_total", data["steps"], timestamp))
+        # Fitbit reports BMR calories for every recorded day, so zero calories
+        # means nothing was recorded (e.g. before the device was worn)
+        if data["calories"]:
+            # Steps
+            metrics.append(self._format_metric("fitbit_steps_total", data["steps"], timestamp))
 
-        # Distance (in kilometers)
-        metrics.append(self._format_metric("fitbit_distance_km", data["distance"], timestamp))
+            # Distance (in kilometers)
+            metrics.append(self._format_metric("fitbit_distance_km", data["distance"], timestamp))
 
-        # Calories
-        metrics.append(self._format_metric("fitbit_calories_total", data["calories"], timestamp))
+            # Calories
+            metrics.append(
+                self._format_metric("fitbit_calories_total", data["calories"], timestamp)
+            )
 
         # Active minutes by type
         for activity_type, minutes in data["active_minutes"].items():
@@ -91,18 +159,21 @@ class VictoriaMetricsWriter:
 
         # Heart rate zones
         for zone in data["heart_rate"]["zones"]:
-            zone_name = zone.get("name", "unknown").lower().replace(" ", "_")
+            # Zones with no time spent in them carry no information
+            if not zone.get("minutes"):
+                continue
+            name = zone.get("name", "unknown")
+            zone_name = _ZONE_LABELS.get(name) or name.lower().replace(" ", "_")
 
             # Minutes in zone
-            if "minutes" in zone:
-                metrics.append(
-                    self._format_metric(
-                        "fitbit_heart_rate_zone_minutes",
-                        zone["minutes"],
-                        timestamp,
-                        {"zone": zone_name},
-                    )
+            metrics.append(
+                self._format_metric(
+                    "fitbit_heart_rate_zone_minutes",
+                    zone["minutes"],
+                    timestamp,
+                    {"zone": zone_name},
                 )
+            )
 
             # Calories in zone
             if "caloriesOut" in zone:
@@ -196,12 +267,15 @@ class VictoriaMetricsWriter:
                             )
                         )
 
-        # Send metrics
-        return self._send_metrics(metrics)
+        logger.debug(f"Formatted {len(metrics)} metrics for {data.get('date')}")
+        return metrics
 
     def write_multiple_days(self, data_points: list[dict]) -> tuple[int, int]:
         """Write multiple days of data.
 
+        Days are combined into requests of about Config.VM_BATCH_POINTS metric
+        lines, so sparse days don't each cost an HTTP request.
+
         Args:
             data_points: List of daily data
 
@@ -210,22 +284,62 @@ class VictoriaMetricsWriter:
         """
         successful = 0
         failed = 0
+        chunk: list[str] = []
+        chunk_days = 0
+
+        def send_chunk() -> None:
+            nonlocal successful, failed, chunk, chunk_days
+            if self._send_metrics(chunk):
+                successful += chunk_days
+            else:
+                failed += chunk_days
+            chunk = []
+            chunk_days = 0
 
         for data in data_points:
             try:
-                if self.write_daily_data(data):
-                    successful += 1
-                else:
-                    failed += 1
+                metrics = self._daily_metrics(data)
             except Exception as e:
                 logger.error(f"Error writing data for {data.get('date')}: {e}")
                 failed += 1
+                continue
+
+            chunk.extend(metrics)
+            chunk_days += 1
+            if len(chunk) >= Config.VM_BATCH_POINTS:
+                send_chunk()
+
+        if chunk_days:
+            send_chunk()
 
         return successful, failed
 
+    def _post(self, payload: str) -> None:
+        """POST metric lines to Victoria Metrics.
+
+        Args:
+            payload: Metric lines in Prometheus format
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails
+        """
+        body = payload.encode("utf-8")
+        headers = {}
+        if Config.VM_COMPRESS_REQUESTS and len(body) >= GZIP_MIN_BYTES:
+            # Repeated metric names and labels compress well; level 1 keeps CPU cost low
+            body = gzip.compress(body, compresslevel=1)
+            headers["Content-Encoding"] = "gzip"
+
+        response = self._session.post(self.endpoint, data=body, headers=headers, timeout=30)
+        response.raise_for_status()
+
     def _send_metrics(self, metrics: list[str]) -> bool:
         """Send metrics to Victoria Metrics.
 
+        If Victoria Metrics is unreachable or failing (or the circuit breaker
+        is open) the metrics are buffered to disk instead, and replayed after
+        the next successful write.
+
         Args:
             metrics: List of formatted metric lines
 
@@ -239,25 +353,93 @@ class VictoriaMetricsWriter:
         # Combine all metrics
         payload = "".join(metrics)
 
-        try:
-            response = requests.post(
-                self.endpoint,
-                data=payload.encode("utf-8"),
-                auth=self.auth,
-                headers={"Content-Type": "text/plain"},
-                timeout=30,
+        if not self._breaker.allow():
+            self._buffer_pending(payload)
+            logger.warning(
+                f"Victoria Metrics unavailable, buffered {len(metrics)} metrics for replay"
             )
+            return False
 
-            response.raise_for_status()
-            logger.info(f"Successfully wrote {len(metrics)} metrics to Victoria Metrics")
-            return True
-
+        try:
+            self._post(payload)
         except requests.exceptions.RequestException as e:
             logger.error(f"Failed to write metrics to Victoria Metrics: {e}")
-            if hasattr(e, "response") and e.response is not None:
+            if e.response is not None:
                 logger.error(f"Response: {e.response.text}")
+            # Connection errors, timeouts and 5xx mean the service is down, so keep
+            # the metrics for replay; a 4xx is a problem with this payload
+            if e.response is None or e.response.status_code >= 500:
+                self._breaker.record_failure()
+                self._buffer_pending(payload)
+            else:
+                self._breaker.record_success()
             return False
 
+        self._breaker.record_success()
+        logger.info(f"Successfully wrote {len(metrics)} metrics to Victoria Metrics")
+        self._replay_pending()
+        return True
+
+    def _buffer_pending(self, payload: str) -> None:
+        """Append metric lines to the pending writes file.
+
+        Once the file exceeds Config.VM_PENDING_MAX_MB the oldest lines are dropped.
+
+        Args:
+            payload: Metric lines in Prometheus format
+        """
+        try:
+            with self._pending_lock:
+                self.pending_file.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.pending_file, "a") as f:
+                    f.write(payload)
+                    size = f.tell()
+                if size > Config.VM_PENDING_MAX_MB * 1024 * 1024:
+                    self._trim_pending()
+        except OSError as e:
+            logger.error(f"Error buffering metrics: {e}")
+
+    def _trim_pending(self) -> None:
+        """Drop the oldest buffered lines so the pending writes file fits its size cap.
+
+        Trims to 90% of the cap so a full buffer isn't rewritten on every append.
+        Must be called with _pending_lock held.
+        """
+        keep_bytes = Config.VM_PENDING_MAX_MB * 1024 * 1024 * 9 // 10
+        data = self.pending_file.read_bytes()
+        # Cut at a line boundary so no partial metric line is kept
+        start = data.find(b"\n", len(data) - keep_bytes - 1) + 1
+        dropped = data.count(b"\n", 0, start)
+        tmp_file = self.pending_file.with_suffix(".tmp")
+        tmp_file.write_bytes(data[start:])
+        os.replace(tmp_file, self.pending_file)
+        logger.warning(
+            f"Pending writes exceeded {Config.VM_PENDING_MAX_MB} MB, dropped {dropped} oldest metrics"
+        )
+
+    def _replay_pending(self) -> None:
+        """Send metrics buffered while Victoria Metrics was unavailable."""
+        with self._pending_lock:
+            if not self.pending_file.exists():
+                return
+            try:
+                lines = self.pending_file.read_text().splitlines(keepends=True)
+                self.pending_file.unlink()
+            except OSError as e:
+                logger.error(f"Error reading buffered metrics: {e}")
+                return
+
+        batch_points = Config.VM_BATCH_POINTS
+        for start in range(0, len(lines), batch_points):
+            try:
+                self._post("".join(lines[start : start + batch_points]))
+            except requests.exceptions.RequestException as e:
+                logger.error(f"Failed to replay buffered metrics: {e}")
+                self._buffer_pending("".join(lines[start:]))
+                return
+
+        logger.info(f"Replayed {len(lines)} buffered metrics to Victoria Metrics")
+
     def write_intraday_data(self, data: dict) -> bool:
         """Write intraday Fitbit data to Victoria Metrics.
 
@@ -272,8 +454,12 @@ class VictoriaMetricsWriter:
             return True  # Nothing to write is success
 
         date_str = data["date"]
-        base_date = datetime.strptime(date_str, "%Y-%m-%d")
+        base_date = parse_date(date_str)
         metrics = []
+        append = metrics.append
+        # Local time maps linearly to Unix time within an hour (DST changes on the hour),
+        # so each hour is converted once instead of once per data point
+        hour_starts: dict[int, int] = {}
 
         for resource, dataset in data["resources"].items():
             dataset_points = dataset.get("dataset", [])
@@ -282,8 +468,8 @@ class VictoriaMetricsWriter:
                 logger.warning(f"No intraday data for {resource} on {date_str}")
                 continue
 
-            # Format metric name
-            metric_name = f"fitbit_{resource}_intraday"
+            # Every point shares the metric name and labels; only value and timestamp vary
+            prefix = f"fitbit_{resource}_intraday{{{self._base_label_str}}} "
 
             # Process each time point
             for point in dataset_points:
@@ -293,11 +479,15 @@ class VictoriaMetricsWriter:
                 # Parse time and create full timestamp
                 try:
                     hour, minute, second = map(int, time_str.split(":"))
-                    point_datetime = base_date.replace(hour=hour, minute=minute, second=second)
-                    timestamp = int(point_datetime.timestamp())
-
-                    # Add metric
-                    metrics.append(self._format_metric(metric_name, value, timestamp))
+                    if not (0 <= minute < 60 and 0 <= second < 60):
+                        raise ValueError("minute and second must be in 0..59")
+                    hour_start = hour_starts.get(hour)
+                    if hour_start is None:
+                        hour_start = int(base_date.replace(hour=hour).timestamp())
+                        hour_starts[hour] = hour_start
+
+                    # Add metric (milliseconds for Prometheus, as in _format_metric)
+                    append(f"{prefix}{value} {(hour_start + minute * 60 + second) * 1000}\n")
                 except (ValueError, KeyError) as e:
                     logger.error(f"Error parsing time point {time_str} for {resource}: {e}")
                     continue
@@ -356,8 +546,8 @@ class VictoriaMetricsWriter:
             last_sync_time = device.get("lastSyncTime")
             if last_sync_time:
                 try:
-                    # Parse ISO 8601 datetime
-                    sync_dt = datetime.fromisoformat(last_sync_time.replace("Z", "+00:00"))
+                    # Parse ISO 8601 datetime (fromisoformat accepts "Z" since Python 3.11)
+                    sync_dt = datetime.fromisoformat(last_sync_time)
                     sync_timestamp = int(sync_dt.timestamp())
                     metrics.append(
                         self._format_metric(
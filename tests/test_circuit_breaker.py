@@ -0,0 +1,50 @@
+"""Tests for the circuit breaker."""
+
+from freezegun import freeze_time
+
+from src.circuit_breaker import CircuitBreaker
+
+
+def test_circuit_breaker_opens_after_threshold():
+    """Test the breaker rejects calls after consecutive failures."""
+    breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=60)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.allow() is True
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.allow() is False
+
+
+def test_circuit_breaker_success_resets_failures():
+    """Test a success in between failures keeps the breaker closed."""
+    breaker = CircuitBreaker("test", failure_threshold=2)
+
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.state == "closed"
+
+
+def test_circuit_breaker_half_open_allows_single_probe():
+    """Test one probe is allowed after the timeout, and its result decides the state."""
+    with freeze_time("2024-01-15 12:00:00") as frozen:
+        breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=60)
+        breaker.record_failure()
+
+        frozen.tick(60)
+        assert breaker.state == "half_open"
+        assert breaker.allow() is True
+        assert breaker.allow() is False  # Probe already in flight
+
+        breaker.record_failure()
+        assert breaker.state == "open"
+
+        frozen.tick(60)
+        assert breaker.allow() is True
+        breaker.record_success()
+        assert breaker.state == "closed"
+        assert breaker.allow() is True
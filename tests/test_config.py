@@ -114,3 +114,135 @@ def test_config_file_paths(tmp_path, monkeypatch):
 
     assert data_dir / "fitbit_tokens.json" == config_module.Config.TOKEN_FILE
     assert data_dir / "sync_state.json" == config_module.Config.STATE_FILE
+
+
+def test_load_secret_caches_resolved_value(monkeypatch):
+    """Test secrets are resolved once and served from cache afterwards."""
+    from src import config as config_module
+
+    monkeypatch.setattr(config_module, "_SECRET_CACHE", {})
+    monkeypatch.setenv("VICTORIA_USER", "first_user")
+
+    assert config_module._load_secret("victoria_user") == "first_user"
+
+    # Changing the environment doesn't affect an already resolved secret
+    monkeypatch.setenv("VICTORIA_USER", "second_user")
+    assert config_module._load_secret("victoria_user") == "first_user"
+
+
+def test_load_secret_missing_raises(monkeypatch):
+    """Test missing secret raises ValueError naming both sources."""
+    from src import config as config_module
+
+    monkeypatch.setattr(config_module, "_SECRET_CACHE", {})
+    monkeypatch.delenv("VICTORIA_PASSWORD", raising=False)
+
+    with pytest.raises(ValueError) as exc_info:
+        config_module._load_secret("victoria_password")
+
+    assert "VICTORIA_PASSWORD" in str(exc_info.value)
+
+
+def test_config_secrets_loaded_lazily(monkeypatch):
+    """Test importing config doesn't require secrets until they are accessed."""
+    import importlib
+
+    from src import config as config_module
+
+    monkeypatch.delenv("VICTORIA_ENDPOINT", raising=False)
+
+    # Reload must succeed even though a secret is missing
+    importlib.reload(config_module)
+
+    with pytest.raises(ValueError):
+        _ = config_module.Config.VICTORIA_ENDPOINT
+
+    monkeypatch.setenv("VICTORIA_ENDPOINT", "http://victoria:8428")
+    assert config_module.Config.VICTORIA_ENDPOINT == "http://victoria:8428"
+    # Resolved value is stored on the class
+    assert "VICTORIA_ENDPOINT" in vars(config_module.Config)
+
+
+def test_dotenv_parsed_once_across_reloads():
+    """Test .env file isn't re-parsed when the config module is reloaded."""
+    import importlib
+    from unittest.mock import patch
+
+    from src import config as config_module
+
+    with patch("dotenv.load_dotenv") as mock_load_dotenv:
+        importlib.reload(config_module)
+
+    mock_load_dotenv.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [("true", True), ("TRUE", True), ("1", True), ("yes", True), ("false", False), ("0", False)],
+)
+def test_env_bool_parsing(monkeypatch, raw, expected):
+    """Test boolean settings are parsed from the environment snapshot."""
+    from src import config as config_module
+
+    monkeypatch.setitem(config_module._ENV, "COLLECT_SLEEP", raw)
+
+    assert config_module._env_bool("COLLECT_SLEEP", not expected) is expected
+
+
+def test_env_bool_default(monkeypatch):
+    """Test boolean settings fall back to default when unset."""
+    from src import config as config_module
+
+    monkeypatch.delitem(config_module._ENV, "COLLECT_SLEEP", raising=False)
+
+    assert config_module._env_bool("COLLECT_SLEEP", True) is True
+    assert config_module._env_bool("COLLECT_SLEEP", False) is False
+
+
+def test_config_validation_reports_unloadable_secret(monkeypatch, tmp_path):
+    """Test validate collects a missing lazily-loaded secret as an error."""
+    import importlib
+
+    from src import config as config_module
+
+    monkeypatch.delenv("VICTORIA_USER", raising=False)
+    importlib.reload(config_module)
+    config_module.Config.DATA_DIR = tmp_path
+
+    with pytest.raises(ValueError) as exc_info:
+        config_module.Config.validate()
+
+    assert str(exc_info.value) == "Configuration errors: VICTORIA_USER is required"
+
+
+def test_config_intraday_resources_parsed_to_tuple(monkeypatch):
+    """Test INTRADAY_RESOURCES is parsed into a tuple, skipping blank entries."""
+    import importlib
+
+    from src import config as config_module
+
+    monkeypatch.setenv("INTRADAY_RESOURCES", " steps, heart_rate ,")
+    importlib.reload(config_module)
+
+    assert config_module.Config.INTRADAY_RESOURCES == ("steps", "heart_rate")
+
+
+def test_load_secret_reads_mounted_file(monkeypatch, tmp_path):
+    """Test mounted secret files take precedence and are stripped."""
+    import os
+
+    from src import config as config_module
+
+    secret_file = tmp_path / "victoria_user"
+    secret_file.write_text("  file_user\n")
+    real_open = os.open
+
+    def fake_open(path, flags):
+        assert path == "/run/secrets/victoria_user"
+        return real_open(secret_file, flags)
+
+    monkeypatch.setattr(config_module, "_SECRET_CACHE", {})
+    monkeypatch.setattr(config_module.os, "open", fake_open)
+    monkeypatch.setenv("VICTORIA_USER", "env_user")
+
+    assert config_module._load_secret("victoria_user") == "file_user"
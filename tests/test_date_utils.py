@@ -0,0 +1,18 @@
+"""Tests for date helpers."""
+
+from datetime import datetime
+
+import pytest
+
+from src.date_utils import parse_date
+
+
+def test_parse_date_matches_strptime():
+    """Test parse_date returns the same midnight datetime as strptime."""
+    assert parse_date("2024-01-15") == datetime.strptime("2024-01-15", "%Y-%m-%d")
+
+
+def test_parse_date_rejects_invalid_dates():
+    """Test invalid dates raise ValueError like strptime did."""
+    with pytest.raises(ValueError):
+        parse_date("2024-13-01")
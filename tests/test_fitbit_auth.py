@@ -1,7 +1,13 @@
 """Tests for Fitbit OAuth2 authentication."""
 
+import contextlib
 import json
+import os
+from datetime import datetime
 from unittest.mock import patch
+from urllib.parse import urlencode
+
+import responses
 
 from src.fitbit_auth import FitbitAuth, TokenManager
 
@@ -174,3 +180,127 @@ def test_token_manager_token_persistence(temp_token_file, sample_tokens):
 
     assert tm2.access_token == tm1.access_token
     assert tm2.refresh_token == tm1.refresh_token
+
+
+@responses.activate
+def test_fitbit_auth_refresh_uses_session_basic_auth(temp_token_file, sample_tokens):
+    """Test token refresh posts via the shared session with client credentials."""
+    with open(temp_token_file, "w") as f:
+        json.dump(sample_tokens, f)
+
+    responses.add(
+        responses.POST,
+        "https://api.fitbit.com/oauth2/token",
+        json={**sample_tokens, "access_token": "refreshed_access_token"},
+        status=200,
+    )
+
+    with patch("src.fitbit_auth.Config") as mock_config:
+        mock_config.TOKEN_FILE = temp_token_file
+        mock_config.FITBIT_TOKEN_URL = "https://api.fitbit.com/oauth2/token"
+        mock_config.FITBIT_CLIENT_ID = "client"
+        mock_config.FITBIT_CLIENT_SECRET = "secret"
+        auth = FitbitAuth()
+
+        auth.refresh_access_token()
+
+    assert auth.token_manager.access_token == "refreshed_access_token"
+    assert len(responses.calls) == 1
+    assert responses.calls[0].request.headers["Authorization"].startswith("Basic ")
+
+
+def test_token_manager_save_is_private_and_atomic(temp_data_dir, sample_tokens):
+    """Test saved token file is owner-only and no temp file is left behind."""
+    token_file = temp_data_dir / "nested" / "fitbit_tokens.json"
+    tm = TokenManager(token_file)
+    tm.update_tokens(sample_tokens)
+
+    assert token_file.exists()
+    assert token_file.stat().st_mode & 0o777 == 0o600
+    assert list(token_file.parent.iterdir()) == [token_file]
+
+
+def test_token_manager_reload_if_changed(temp_token_file, sample_tokens):
+    """Test tokens are only re-read when the file changed on disk."""
+    tm = TokenManager(temp_token_file)
+    tm.update_tokens(sample_tokens)
+
+    with patch.object(tm, "_load_tokens") as mock_load:
+        tm.reload_if_changed()
+        mock_load.assert_not_called()
+
+    # Simulate another process writing newer tokens
+    with open(temp_token_file, "w") as f:
+        json.dump({**sample_tokens, "refresh_token": "other_process_token"}, f)
+    os.utime(temp_token_file, ns=(0, tm._token_mtime_ns + 1_000_000))
+
+    tm.reload_if_changed()
+
+    assert tm.refresh_token == "other_process_token"
+
+
+def test_token_manager_expiry_stored_as_timestamp(temp_token_file, sample_tokens):
+    """Test expiry is persisted as a unix timestamp and round-trips."""
+    tm = TokenManager(temp_token_file)
+    tm.update_tokens(sample_tokens)
+
+    with open(temp_token_file) as f:
+        data = json.load(f)
+
+    assert isinstance(data["expires_at"], float)
+    assert tm.is_expired() is False
+    assert TokenManager(temp_token_file).expires_at == tm.expires_at
+
+
+def test_token_manager_loads_legacy_iso_expiry(temp_token_file, sample_tokens):
+    """Test token files with ISO datetime expiry from older versions still load."""
+    with open(temp_token_file, "w") as f:
+        json.dump({**sample_tokens, "expires_at": "2000-01-01T00:00:00"}, f)
+
+    tm = TokenManager(temp_token_file)
+
+    assert tm.expires_at == datetime(2000, 1, 1).timestamp()
+    assert tm.is_expired() is True
+
+
+def test_fitbit_auth_authorize_waits_for_callback_code():
+    """Test authorize serves requests until the callback delivers a code."""
+    import socket
+    import threading
+    import urllib.error
+    import urllib.request
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    def fake_browser(_url):
+        def hit_callback():
+            base = f"http://127.0.0.1:{port}"
+            for path in ("/favicon.ico", "/callback?code=abc123"):
+                # Non-callback requests get a 400 response
+                with contextlib.suppress(urllib.error.HTTPError):
+                    urllib.request.urlopen(base + path, timeout=5).read()
+
+        threading.Thread(target=hit_callback, daemon=True).start()
+
+    auth = FitbitAuth()
+    with (
+        patch("src.fitbit_auth.webbrowser.open", side_effect=fake_browser),
+        patch.object(auth, "exchange_code_for_token") as mock_exchange,
+    ):
+        auth.authorize(port=port)
+
+    mock_exchange.assert_called_once_with("abc123")
+
+
+def test_fitbit_auth_authorization_url_cached():
+    """Test authorization URL is built once and reused."""
+    auth = FitbitAuth()
+
+    with patch("src.fitbit_auth.urlencode", wraps=urlencode) as mock_urlencode:
+        first = auth.get_authorization_url()
+        second = auth.get_authorization_url()
+
+    assert first == second
+    assert mock_urlencode.call_count == 1
@@ -1,7 +1,9 @@
 """Tests for Fitbit data collector."""
 
-from datetime import datetime
-from unittest.mock import Mock
+import threading
+import time
+from datetime import date, datetime
+from unittest.mock import Mock, patch
 
 import pytest
 import responses
@@ -9,7 +11,15 @@ from requests.exceptions import HTTPError
 
 from src.config import Config
 from src.fitbit_auth import FitbitAuth
-from src.fitbit_collector import FitbitCollector, RateLimitError
+from src.fitbit_collector import (
+    MAX_ATTEMPTS,
+    MAX_BACKOFF_SECONDS,
+    SUMMARY_CACHE_SECONDS,
+    FitbitCollector,
+    RateLimitError,
+    _date_str,
+)
+from src.response_cache import ResponseCache
 
 
 @pytest.fixture
@@ -102,6 +112,26 @@ def test_make_request_success(collector):
     assert responses.calls[0].request.headers["Authorization"] == "Bearer test_access_token"
 
 
+@responses.activate
+def test_make_request_reuses_session_and_updates_token(collector, mock_auth):
+    """Test requests share one session whose bearer token follows refreshes."""
+    responses.add(
+        responses.GET,
+        f"{Config.FITBIT_API_BASE_URL}/test/endpoint",
+        json={"result": "success"},
+        status=200,
+    )
+
+    session = collector._session
+    collector._make_request("/test/endpoint")
+    mock_auth.get_valid_token.return_value = "refreshed_token"
+    collector._make_request("/test/endpoint")
+
+    assert collector._session is session
+    assert responses.calls[0].request.headers["Authorization"] == "Bearer test_access_token"
+    assert responses.calls[1].request.headers["Authorization"] == "Bearer refreshed_token"
+
+
 @responses.activate
 def test_make_request_rate_limit(collector):
     """Test rate limit error handling."""
@@ -275,8 +305,10 @@ def test_rate_limit_error_attributes():
 
 
 @responses.activate
-def test_get_daily_data_no_distance(collector, sample_heart_rate_response):
+def test_get_daily_data_no_distance(collector, sample_heart_rate_response, monkeypatch):
     """Test daily data when activity has no distances."""
+    # Unmocked optional metric endpoints fail as connection errors; skip retry backoff
+    monkeypatch.setattr("src.fitbit_collector.time.sleep", lambda s: None)
     test_date = datetime(2024, 1, 15)
 
     # Activity response without distances
@@ -489,3 +521,420 @@ def test_get_device_info(collector):
     assert result[0]["deviceVersion"] == "Charge 6"
     assert result[0]["battery"] == "High"
     assert result[0]["batteryLevel"] == 85
+
+
+@responses.activate
+def test_make_request_takes_token_from_bucket(collector, mock_auth):
+    """Test every API request draws from the shared rate-limit bucket."""
+    responses.add(
+        responses.GET,
+        "https://api.fitbit.com/1/user/-/devices.json",
+        json=[],
+        status=200,
+    )
+
+    with patch.object(collector._bucket, "acquire") as acquire:
+        collector.get_device_info()
+
+    acquire.assert_called_once_with()
+
+
+@responses.activate
+def test_make_request_serves_settled_days_from_cache(mock_auth, tmp_path):
+    """Test re-fetching a settled day skips the network."""
+    cache = ResponseCache(tmp_path / "fitbit_cache")
+    collector = FitbitCollector(mock_auth, cache=cache)
+    responses.add(
+        responses.GET,
+        "https://api.fitbit.com/1/user/-/activities/date/2020-01-01.json",
+        json={"summary": {"steps": 42}},
+        status=200,
+    )
+
+    first = collector.get_activity_summary(datetime(2020, 1, 1))
+    second = collector.get_activity_summary(datetime(2020, 1, 1))
+    cache.close()
+
+    assert first == second == {"steps": 42}
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_make_request_revalidates_with_etag(mock_auth, tmp_path):
+    """Test an expired entry is revalidated and a 304 reuses cached data."""
+    cache = ResponseCache(tmp_path / "fitbit_cache")
+    collector = FitbitCollector(mock_auth, cache=cache)
+    key = cache.key("/devices.json")
+    cache.set(key, [{"id": "1"}], {"ETag": '"v1"'})
+    stale = {**cache.get(key), "stored_at": 0}
+    cache.shelf[key] = stale
+    responses.add(
+        responses.GET,
+        "https://api.fitbit.com/1/user/-/devices.json",
+        status=304,
+        match=[responses.matchers.header_matcher({"If-None-Match": '"v1"'})],
+    )
+
+    result = collector.get_device_info()
+
+    assert result == [{"id": "1"}]
+    assert cache.get(key)["stored_at"] > 0
+    cache.close()
+
+
+def _add_range_series(resource, values):
+    """Register a mocked activity time series range response."""
+    responses.add(
+        responses.GET,
+        f"{Config.FITBIT_API_BASE_URL}/activities/{resource}/date/2024-01-01/2024-01-02.json",
+        json={
+            f"activities-{resource}": [
+                {"dateTime": f"2024-01-0{i + 1}", "value": v} for i, v in enumerate(values)
+            ]
+        },
+        status=200,
+    )
+
+
+@responses.activate
+def test_get_historical_data_uses_range_requests(collector, monkeypatch):
+    """Test core metrics for a range come from one request per metric, not per day."""
+    for name in (
+        "COLLECT_SLEEP",
+        "COLLECT_SPO2",
+        "COLLECT_BREATHING_RATE",
+        "COLLECT_HRV",
+        "COLLECT_CARDIO_FITNESS",
+        "COLLECT_TEMPERATURE",
+    ):
+        monkeypatch.setattr(Config, name, False)
+
+    _add_range_series("steps", ["1000", "2000"])
+    _add_range_series("distance", ["0.8", "1.6"])
+    _add_range_series("calories", ["2100", "2200"])
+    _add_range_series("minutesSedentary", ["600", "610"])
+    _add_range_series("minutesLightlyActive", ["100", "110"])
+    _add_range_series("minutesFairlyActive", ["10", "11"])
+    _add_range_series("minutesVeryActive", ["5", "6"])
+    responses.add(
+        responses.GET,
+        f"{Config.FITBIT_API_BASE_URL}/activities/heart/date/2024-01-01/2024-01-02.json",
+        json={
+            "activities-heart": [
+                {"dateTime": "2024-01-01", "value": {"restingHeartRate": 60}},
+                {"dateTime": "2024-01-02", "value": {"restingHeartRate": 61}},
+            ]
+        },
+        status=200,
+    )
+
+    result = collector.get_historical_data(datetime(2024, 1, 1), datetime(2024, 1, 2))
+
+    assert len(responses.calls) == 8
+    assert [d["date"] for d in result] == ["2024-01-01", "2024-01-02"]
+    assert result[1]["steps"] == 2000
+    assert result[1]["distance"] == 1.6
+    assert result[1]["calories"] == 2200
+    assert result[1]["active_minutes"] == {
+        "sedentary": 610,
+        "lightly_active": 110,
+        "fairly_active": 11,
+        "very_active": 6,
+    }
+    assert result[1]["heart_rate"] == {"resting": 61, "zones": []}
+
+
+def test_get_historical_data_falls_back_to_per_day(collector, monkeypatch):
+    """Test days missing from a failed range request are fetched individually."""
+    monkeypatch.setattr(
+        collector, "get_daily_core_range", Mock(side_effect=HTTPError("range failed"))
+    )
+    monkeypatch.setattr(
+        collector, "get_daily_data", lambda date: {"date": date.strftime("%Y-%m-%d")}
+    )
+
+    result = collector.get_historical_data(datetime(2024, 1, 1), datetime(2024, 1, 2))
+
+    assert [d["date"] for d in result] == ["2024-01-01", "2024-01-02"]
+    collector.get_daily_core_range.assert_called_once()
+
+
+@responses.activate
+def test_make_request_retries_server_errors(collector, monkeypatch):
+    """Test 5xx responses are retried with backoff before succeeding."""
+    sleeps = []
+    monkeypatch.setattr("src.fitbit_collector.time.sleep", sleeps.append)
+    url = f"{Config.FITBIT_API_BASE_URL}/test/endpoint"
+    responses.add(responses.GET, url, status=503)
+    responses.add(responses.GET, url, status=502)
+    responses.add(responses.GET, url, json={"ok": True}, status=200)
+
+    assert collector._make_request("/test/endpoint") == {"ok": True}
+    assert len(responses.calls) == 3
+    assert len(sleeps) == 2
+    assert all(0 <= s <= MAX_BACKOFF_SECONDS for s in sleeps)
+
+
+@responses.activate
+def test_make_request_gives_up_after_max_attempts(collector, monkeypatch):
+    """Test persistent server errors are raised once attempts are exhausted."""
+    monkeypatch.setattr("src.fitbit_collector.time.sleep", lambda s: None)
+    responses.add(responses.GET, f"{Config.FITBIT_API_BASE_URL}/test/endpoint", status=500)
+
+    with pytest.raises(HTTPError):
+        collector._make_request("/test/endpoint")
+
+    assert len(responses.calls) == MAX_ATTEMPTS
+
+
+@responses.activate
+def test_make_request_does_not_retry_client_errors(collector, monkeypatch):
+    """Test 4xx responses other than 429 fail without retrying."""
+    sleeps = []
+    monkeypatch.setattr("src.fitbit_collector.time.sleep", sleeps.append)
+    responses.add(responses.GET, f"{Config.FITBIT_API_BASE_URL}/test/endpoint", status=404)
+
+    with pytest.raises(HTTPError):
+        collector._make_request("/test/endpoint")
+
+    assert len(responses.calls) == 1
+    assert sleeps == []
+
+
+def test_get_daily_data_fetches_optional_metrics_concurrently(collector, monkeypatch):
+    """Test optional metrics run in parallel and failures fall back to defaults."""
+    barrier = threading.Barrier(2, timeout=5)
+
+    def wait_for_peer(date):
+        barrier.wait()  # Deadlocks (and times out) unless both run concurrently
+        return {"ok": True}
+
+    monkeypatch.setattr(collector, "get_activity_summary", lambda date: {"steps": 1})
+    monkeypatch.setattr(collector, "get_heart_rate", lambda date: {})
+    monkeypatch.setattr(collector, "get_sleep_data", wait_for_peer)
+    monkeypatch.setattr(collector, "get_spo2_data", wait_for_peer)
+    monkeypatch.setattr(collector, "get_hrv_data", Mock(side_effect=ValueError("boom")))
+    monkeypatch.setattr(Config, "COLLECT_BREATHING_RATE", False)
+    monkeypatch.setattr(Config, "COLLECT_CARDIO_FITNESS", False)
+    monkeypatch.setattr(Config, "COLLECT_TEMPERATURE", False)
+
+    result = collector.get_daily_data(datetime(2024, 1, 15))
+
+    assert result["sleep"] == {"ok": True}
+    assert result["spo2"] == {"ok": True}
+    assert result["hrv"] == []
+    assert "temperature" not in result
+
+
+def test_get_daily_data_reraises_optional_metric_rate_limit(collector, monkeypatch):
+    """Test a rate-limited optional metric still surfaces RateLimitError."""
+    monkeypatch.setattr(collector, "get_activity_summary", lambda date: {"steps": 1})
+    monkeypatch.setattr(collector, "get_heart_rate", lambda date: {})
+    for name in (
+        "get_sleep_data",
+        "get_spo2_data",
+        "get_breathing_rate",
+        "get_cardio_fitness_score",
+    ):
+        monkeypatch.setattr(collector, name, lambda date: {})
+    monkeypatch.setattr(collector, "get_temperature_data", lambda date: [])
+    monkeypatch.setattr(
+        collector, "get_hrv_data", Mock(side_effect=RateLimitError("Rate limited", 30))
+    )
+
+    with pytest.raises(RateLimitError):
+        collector.get_daily_data(datetime(2024, 1, 15))
+
+
+@pytest.mark.parametrize(
+    "value", [datetime(2024, 1, 5), datetime(2024, 1, 5, 23, 59, 59), date(2024, 1, 5)]
+)
+def test_date_str_matches_strftime(value):
+    """Test the fast date formatter matches the YYYY-MM-DD strftime format."""
+    assert _date_str(value) == value.strftime("%Y-%m-%d") == "2024-01-05"
+
+
+@responses.activate
+def test_get_steps_reuses_recent_activity_summary(collector, sample_activity_response, monkeypatch):
+    """Test get_steps after get_activity_summary doesn't refetch within the TTL."""
+    # Start from the real clock so the shared rate limiter stays consistent
+    now = [time.monotonic()]
+    monkeypatch.setattr("src.fitbit_collector.time.monotonic", lambda: now[0])
+    responses.add(
+        responses.GET,
+        f"{Config.FITBIT_API_BASE_URL}/activities/date/2024-01-15.json",
+        json=sample_activity_response,
+        status=200,
+    )
+    test_date = datetime(2024, 1, 15)
+
+    collector.get_activity_summary(test_date)
+    now[0] += 30
+    assert collector.get_steps(test_date) == 10000
+    assert len(responses.calls) == 1
+
+    # Expired entries are fetched again
+    now[0] += SUMMARY_CACHE_SECONDS
+    collector.get_steps(test_date)
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_seconds_since_last_request(collector, sample_activity_response, monkeypatch):
+    """Test the collector reports how long ago it last called the API."""
+    now = [time.monotonic()]
+    monkeypatch.setattr("src.fitbit_collector.time.monotonic", lambda: now[0])
+    responses.add(
+        responses.GET,
+        f"{Config.FITBIT_API_BASE_URL}/activities/date/2024-01-15.json",
+        json=sample_activity_response,
+        status=200,
+    )
+
+    assert collector.seconds_since_last_request() == float("inf")
+
+    collector.get_activity_summary(datetime(2024, 1, 15))
+    now[0] += 42
+    assert collector.seconds_since_last_request() == 42
+
+
+@responses.activate
+def test_make_request_remembers_not_found(mock_auth, tmp_path):
+    """Test a 404 for a settled day is cached so later calls skip the network."""
+    cache = ResponseCache(tmp_path / "fitbit_cache")
+    collector = FitbitCollector(mock_auth, cache=cache)
+    responses.add(
+        responses.GET,
+        f"{Config.FITBIT_API_BASE_URL}/hrv/date/2020-01-01.json",
+        json={"errors": [{"errorType": "not_found"}]},
+        status=404,
+    )
+
+    assert collector.get_hrv_data(datetime(2020, 1, 1)) == []
+    assert collector.get_hrv_data(datetime(2020, 1, 1)) == []
+    cache.close()
+
+    assert len(responses.calls) == 1
+
+
+def test_get_intraday_data_dispatches_per_resource(mock_auth, monkeypatch):
+    """Test each configured resource is routed to its intraday fetcher."""
+    monkeypatch.setattr(Config, "ENABLE_INTRADAY_COLLECTION", True)
+    monkeypatch.setattr(Config, "INTRADAY_RESOURCES", ("steps", "heart_rate"))
+    monkeypatch.setattr(Config, "INTRADAY_DETAIL_LEVEL", "15min")
+    monkeypatch.setattr(Config, "INTRADAY_HEART_RATE_DETAIL", "1sec")
+    monkeypatch.setattr(
+        FitbitCollector,
+        "get_intraday_activity",
+        lambda self, date, resource, detail: {"resource": resource, "detail": detail},
+    )
+    monkeypatch.setattr(
+        FitbitCollector,
+        "get_intraday_heart_rate",
+        lambda self, date, detail: {"resource": "heart", "detail": detail},
+    )
+    collector = FitbitCollector(mock_auth)
+
+    result = collector.get_intraday_data(datetime(2024, 1, 15))
+
+    assert result["resources"] == {
+        "steps": {"resource": "steps", "detail": "15min"},
+        "heart_rate": {"resource": "heart", "detail": "1sec"},
+    }
+
+
+def test_get_daily_core_range_fetches_concurrently(collector, monkeypatch):
+    """Test range requests for a chunk are in flight at the same time."""
+    barrier = threading.Barrier(2, timeout=5)
+
+    def steps_range(start, end):
+        barrier.wait()
+        return {"2024-01-01": 100}
+
+    def heart_rate_range(start, end):
+        barrier.wait()
+        return {"2024-01-01": {"restingHeartRate": 55}}
+
+    monkeypatch.setattr(collector, "get_steps_range", steps_range)
+    monkeypatch.setattr(collector, "get_heart_rate_range", heart_rate_range)
+    monkeypatch.setattr(collector, "get_activity_time_series", lambda *args: {})
+
+    core = collector.get_daily_core_range(datetime(2024, 1, 1), datetime(2024, 1, 1))
+
+    assert core == {"2024-01-01": ({"steps": 100}, {"restingHeartRate": 55})}
+
+
+def test_get_daily_data_short_circuits_empty_summary(collector, monkeypatch):
+    """Test a day without an activity summary skips all further requests."""
+    monkeypatch.setattr(collector, "get_activity_summary", lambda date: {})
+    heart_rate = Mock()
+    sleep = Mock()
+    monkeypatch.setattr(collector, "get_heart_rate", heart_rate)
+    monkeypatch.setattr(collector, "get_sleep_data", sleep)
+
+    result = collector.get_daily_data(datetime(2024, 1, 15))
+
+    assert result["empty"] is True
+    assert result["steps"] == 0
+    assert result["heart_rate"] == {"resting": 0, "zones": []}
+    heart_rate.assert_not_called()
+    sleep.assert_not_called()
+
+
+def test_build_daily_data_copies_only_used_zone_fields(collector):
+    """Test heart rate zones are copied, not aliased, and trimmed to known fields."""
+    zones = [{"name": "Peak", "min": 150, "max": 220, "minutes": 5, "extra": "x"}]
+
+    result = collector._build_daily_data(
+        datetime(2024, 1, 15), {}, {"restingHeartRate": 60, "heartRateZones": zones}
+    )
+
+    assert result["heart_rate"]["zones"] == [{"name": "Peak", "min": 150, "max": 220, "minutes": 5}]
+    assert result["heart_rate"]["zones"][0] is not zones[0]
+
+
+def test_get_historical_data_drops_failed_days(collector, monkeypatch):
+    """Test days that fail are left out while the rest keep date order."""
+    monkeypatch.setattr(collector, "get_daily_core_range", lambda start, end: {})
+
+    def daily(date):
+        if date.day == 2:
+            raise ValueError("boom")
+        return {"date": date.strftime("%Y-%m-%d")}
+
+    monkeypatch.setattr(collector, "get_daily_data", daily)
+
+    result = collector.get_historical_data(datetime(2024, 1, 1), datetime(2024, 1, 3))
+
+    assert [d["date"] for d in result] == ["2024-01-01", "2024-01-03"]
+
+
+def test_get_pacing_delay_falls_back_without_headers(collector):
+    """Test the fallback delay is used before any quota headers are seen."""
+    assert collector.get_pacing_delay() == 30.0
+
+
+@responses.activate
+def test_get_pacing_delay_spreads_remaining_quota(collector):
+    """Test pacing divides the time to quota reset over the remaining requests."""
+    responses.add(
+        responses.GET,
+        f"{Config.FITBIT_API_BASE_URL}/test/endpoint",
+        json={},
+        headers={"Fitbit-Rate-Limit-Remaining": "120", "Fitbit-Rate-Limit-Reset": "1800"},
+        status=200,
+    )
+
+    collector._make_request("/test/endpoint")
+
+    assert collector.rate_limit_remaining == 120
+    assert collector.rate_limit_reset == 1800
+    assert collector.get_pacing_delay() == 15.0
+
+
+def test_get_pacing_delay_has_floor(collector):
+    """Test a plentiful quota never paces faster than one request per second."""
+    collector.rate_limit_remaining = 150
+    collector.rate_limit_reset = 10
+
+    assert collector.get_pacing_delay() == 1.0
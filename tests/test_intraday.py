@@ -84,13 +84,14 @@ def test_backfill_intraday_from_config_start_date(
     }
     mock_collector.get_intraday_data.return_value = mock_intraday
 
-    with patch("time.sleep"):  # Don't actually sleep
+    with patch.object(scheduler, "_sleep", return_value=False):  # Don't actually sleep
         scheduler.backfill_intraday_data()
 
     # Should backfill from 2024-01-01 to yesterday (2024-01-09)
     assert mock_collector.get_intraday_data.call_count == 9
     assert mock_writer.write_intraday_data.call_count == 9
-    assert mock_state.update_intraday_backfill.call_count == 9
+    assert mock_state.update_intraday_backfill_memory.call_count == 9
+    mock_state.flush.assert_called()
 
 
 @freeze_time("2024-01-10 12:00:00")
@@ -107,7 +108,7 @@ def test_backfill_intraday_resume_from_last_date(
     }
     mock_collector.get_intraday_data.return_value = mock_intraday
 
-    with patch("time.sleep"):
+    with patch.object(scheduler, "_sleep", return_value=False):
         scheduler.backfill_intraday_data()
 
     # Should backfill from 2024-01-06 to yesterday (2024-01-09) = 4 days
@@ -128,7 +129,7 @@ def test_backfill_intraday_with_backfill_days(
     }
     mock_collector.get_intraday_data.return_value = mock_intraday
 
-    with patch("time.sleep"):
+    with patch.object(scheduler, "_sleep", return_value=False):
         scheduler.backfill_intraday_data()
 
     # Should backfill last 3 days (2024-01-07, 2024-01-08, 2024-01-09)
@@ -143,11 +144,11 @@ def test_backfill_intraday_no_data_available(
     # Return empty resources
     mock_collector.get_intraday_data.return_value = {"date": "2024-01-01", "resources": {}}
 
-    with patch("time.sleep"):
+    with patch.object(scheduler, "_sleep", return_value=False):
         scheduler.backfill_intraday_data()
 
     # Should still update state to avoid re-processing
-    assert mock_state.update_intraday_backfill.call_count == 9
+    assert mock_state.update_intraday_backfill_memory.call_count == 9
 
 
 @freeze_time("2024-01-10 12:00:00")
@@ -168,7 +169,7 @@ def test_backfill_intraday_handles_rate_limit(
         mock_intraday
     ] * 8  # Remaining days
 
-    with patch("time.sleep"):
+    with patch.object(scheduler, "_sleep", return_value=False):
         scheduler.backfill_intraday_data()
 
     # Should retry and eventually succeed for all 9 days
@@ -188,12 +189,12 @@ def test_backfill_intraday_stops_on_quota_exhausted(
 
     mock_collector.get_intraday_data.side_effect = [rate_limit] * 10
 
-    with patch("time.sleep"):
+    with patch.object(scheduler, "_sleep", return_value=False):
         scheduler.backfill_intraday_data()
 
     # Should try 3 times, then wait for quota reset, then try once more, then stop
     # Only processes first date before stopping
-    assert mock_state.update_intraday_backfill.call_count == 0  # None succeeded
+    assert mock_state.update_intraday_backfill_memory.call_count == 0  # None succeeded
 
 
 @freeze_time("2024-01-10 12:00:00")
@@ -208,13 +209,13 @@ def test_backfill_intraday_write_failure(
     mock_collector.get_intraday_data.return_value = mock_intraday
     mock_writer.write_intraday_data.return_value = False  # Write fails
 
-    with patch("time.sleep"):
+    with patch.object(scheduler, "_sleep", return_value=False):
         scheduler.backfill_intraday_data()
 
     # Should still try all days even with write failures
     assert mock_collector.get_intraday_data.call_count == 9
     # Should NOT update state on write failure
-    assert mock_state.update_intraday_backfill.call_count == 0
+    assert mock_state.update_intraday_backfill_memory.call_count == 0
 
 
 @freeze_time("2024-01-10 12:00:00")
@@ -263,7 +264,7 @@ def test_sync_intraday_handles_rate_limit(scheduler, mock_collector, mock_config
     """Test intraday sync handles rate limits."""
     mock_collector.get_intraday_data.side_effect = RateLimitError("Rate limited", retry_after=60)
 
-    with patch("time.sleep"):
+    with patch.object(scheduler, "_sleep", return_value=False):
         scheduler.sync_intraday_data()
 
     # Should have tried to collect
@@ -0,0 +1,38 @@
+"""Tests for JSON encoding helpers."""
+
+import pytest
+
+from src import json_compat
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def codec(request, monkeypatch):
+    """Run each test with orjson (if installed) and with the stdlib fallback."""
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(json_compat, "orjson", None)
+    return json_compat
+
+
+def test_dumps_returns_bytes(codec):
+    """Test dumps produces UTF-8 encoded bytes."""
+    assert codec.loads(codec.dumps({"a": 1})) == {"a": 1}
+    assert isinstance(codec.dumps({"a": 1}), bytes)
+
+
+def test_dumps_indent(codec):
+    """Test dumps pretty-prints with two-space indentation."""
+    assert codec.dumps({"a": 1}, indent=True) == b'{\n  "a": 1\n}'
+
+
+def test_loads_accepts_str_and_bytes(codec):
+    """Test loads accepts both str and bytes input."""
+    assert codec.loads('{"a": [1, 2]}') == {"a": [1, 2]}
+    assert codec.loads(b'{"a": [1, 2]}') == {"a": [1, 2]}
+
+
+def test_loads_invalid_raises_value_error(codec):
+    """Test invalid JSON raises ValueError for both backends."""
+    with pytest.raises(ValueError):
+        codec.loads(b"invalid json {")
@@ -1,7 +1,9 @@
 """Tests for main entry point."""
 
 import logging
+import subprocess
 import sys
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -47,6 +49,31 @@ def test_setup_logging_with_file_handler(monkeypatch, tmp_path):
     assert log_file.exists()
 
 
+def test_setup_logging_does_not_duplicate_file_handler(monkeypatch, tmp_path):
+    """Test repeated setup_logging calls don't open the log file again."""
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    monkeypatch.setattr(Config, "DATA_DIR", data_dir)
+
+    logging.root.handlers = []
+
+    opened = []
+
+    class SpyFileHandler(logging.FileHandler):
+        def __init__(self, filename, *args, **kwargs):
+            opened.append(filename)
+            super().__init__(filename, *args, **kwargs)
+
+    monkeypatch.setattr(logging, "FileHandler", SpyFileHandler)
+
+    main.setup_logging("INFO")
+    main.setup_logging("INFO")
+
+    assert len(opened) == 1
+    file_handlers = [h for h in logging.root.handlers if isinstance(h, logging.FileHandler)]
+    assert len(file_handlers) == 1
+
+
 def test_setup_logging_levels(tmp_path):
     """Test setup_logging accepts different log levels."""
     # Test with non-existent dir to avoid file handler issues
@@ -132,7 +159,7 @@ def test_authorize_failure(mock_auth_class):
     assert exc_info.value.code == 1
 
 
-@patch("main.SyncScheduler")
+@patch("src.scheduler.SyncScheduler")
 def test_run_sync(mock_scheduler_class):
     """Test run_sync starts the scheduler."""
     mock_scheduler = MagicMock()
@@ -158,6 +185,21 @@ def test_main_default_run_sync(mock_validate, mock_setup_logging, mock_run_sync)
     mock_run_sync.assert_called_once()
 
 
+@patch("main.parse_args")
+@patch("main.run_sync")
+@patch("main.setup_logging")
+@patch.object(Config, "validate")
+def test_main_default_skips_argparse(
+    mock_validate, mock_setup_logging, mock_run_sync, mock_parse_args
+):
+    """Test main doesn't build the argument parser when no flags are given."""
+    with patch.object(sys, "argv", ["main.py"]):
+        main.main()
+
+    mock_parse_args.assert_not_called()
+    mock_run_sync.assert_called_once()
+
+
 @patch("main.authorize")
 @patch("main.setup_logging")
 @patch.object(Config, "validate")
@@ -228,3 +270,13 @@ def test_main_validation_error(mock_validate, mock_setup_logging, mock_run_sync)
     assert exc_info.value.code == 1
     mock_setup_logging.assert_not_called()
     mock_run_sync.assert_not_called()
+
+
+def test_authorize_path_does_not_import_scheduler():
+    """Test importing main leaves APScheduler unloaded until the sync is started."""
+    code = (
+        "import sys, main; sys.exit('apscheduler' in sys.modules or 'src.scheduler' in sys.modules)"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=Path(main.__file__).parent)
+
+    assert result.returncode == 0
@@ -0,0 +1,103 @@
+"""Tests for the Fitbit API rate limiter."""
+
+from unittest.mock import patch
+
+import pytest
+
+from src.rate_limiter import TokenBucket
+
+
+class FakeClock:
+    """Monotonic clock that only advances when slept on."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    """Patch the limiter's time source with a fake clock."""
+    fake = FakeClock()
+    with (
+        patch("src.rate_limiter.time.monotonic", fake.monotonic),
+        patch("src.rate_limiter.time.sleep", fake.sleep),
+    ):
+        yield fake
+
+
+def test_acquire_does_not_block_while_tokens_remain(clock):
+    """Test requests proceed back-to-back until the budget is spent."""
+    bucket = TokenBucket(capacity=3, refill_rate=1.0)
+
+    for _ in range(3):
+        bucket.acquire()
+
+    assert clock.sleeps == []
+    assert bucket.tokens == pytest.approx(0)
+
+
+def test_acquire_waits_for_refill_when_empty(clock):
+    """Test an empty bucket sleeps only until the next token is available."""
+    bucket = TokenBucket(capacity=1, refill_rate=0.5)
+    bucket.acquire()
+
+    clock.now += 1  # Half a token refilled
+    bucket.acquire()
+
+    assert clock.sleeps == [pytest.approx(1.0)]
+
+
+def test_refill_is_capped_at_capacity(clock):
+    """Test idle time never accumulates more than capacity tokens."""
+    bucket = TokenBucket(capacity=2, refill_rate=1.0)
+    bucket.acquire()
+
+    clock.now += 3600
+
+    assert bucket.tokens == 2
+
+
+def test_default_bucket_matches_fitbit_quota():
+    """Test the default bucket allows 150 requests per hour."""
+    bucket = TokenBucket()
+
+    assert bucket.capacity == 150
+    assert bucket.refill_rate * 3600 == pytest.approx(150)
+
+
+def test_sync_from_headers_lowers_tokens_to_server_remaining(clock):
+    """Test the server's remaining count caps the local estimate."""
+    bucket = TokenBucket(capacity=150, refill_rate=150 / 3600)
+
+    bucket.sync_from_headers(remaining=10, reset_seconds=600)
+
+    assert bucket.tokens == pytest.approx(10)
+
+
+def test_sync_from_headers_never_raises_tokens(clock):
+    """Test a stale header can't grant more tokens than the bucket holds."""
+    bucket = TokenBucket(capacity=5, refill_rate=1.0)
+    for _ in range(5):
+        bucket.acquire()
+
+    bucket.sync_from_headers(remaining=100, reset_seconds=600)
+
+    assert bucket.tokens == pytest.approx(0)
+
+
+def test_sync_from_headers_blocks_until_reset_when_exhausted(clock):
+    """Test an exhausted quota makes acquire() wait until the window resets."""
+    bucket = TokenBucket(capacity=150, refill_rate=150 / 3600)
+
+    bucket.sync_from_headers(remaining=0, reset_seconds=900)
+    bucket.acquire()
+
+    assert clock.sleeps == [pytest.approx(900)]
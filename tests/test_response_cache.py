@@ -0,0 +1,84 @@
+"""Tests for the Fitbit API response cache."""
+
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+
+from src.response_cache import LONG_TTL_SECONDS, SHORT_TTL_SECONDS, ResponseCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Create a ResponseCache backed by a temporary file."""
+    cache = ResponseCache(tmp_path / "cache" / "fitbit_cache")
+    yield cache
+    cache.close()
+
+
+def test_key_ignores_param_order():
+    """Test identical requests map to the same key regardless of param order."""
+    assert ResponseCache.key("/a.json", {"x": 1, "y": 2}) == ResponseCache.key(
+        "/a.json", {"y": 2, "x": 1}
+    )
+    assert ResponseCache.key("/a.json") != ResponseCache.key("/b.json")
+
+
+@pytest.mark.parametrize(
+    "endpoint,expected",
+    [
+        ("/activities/date/2024-01-01.json", None),
+        ("/activities/date/2024-01-14.json", SHORT_TTL_SECONDS),
+        ("/activities/heart/date/2024-01-01/2024-01-14.json", SHORT_TTL_SECONDS),
+        ("/profile.json", LONG_TTL_SECONDS),
+        ("/devices.json", SHORT_TTL_SECONDS),
+    ],
+)
+def test_ttl_for(endpoint, expected):
+    """Test settled days never expire while recent data is short-lived."""
+    assert ResponseCache.ttl_for(endpoint, today=date(2024, 1, 15)) == expected
+
+
+def test_set_and_get_persist_across_instances(tmp_path):
+    """Test entries survive reopening the cache file."""
+    path = tmp_path / "fitbit_cache"
+    first = ResponseCache(path)
+    first.set("k", {"steps": 1}, {"ETag": '"abc"'})
+    first.close()
+
+    second = ResponseCache(path)
+    entry = second.get("k")
+    second.close()
+
+    assert entry["data"] == {"steps": 1}
+    assert entry["etag"] == '"abc"'
+
+
+def test_is_fresh_respects_ttl(cache):
+    """Test short-TTL entries expire while settled days stay fresh."""
+    cache.set("k", {})
+    entry = cache.get("k")
+
+    with patch("src.response_cache.time.time", return_value=entry["stored_at"] + 3600):
+        assert not cache.is_fresh(entry, "/devices.json")
+        assert cache.is_fresh(entry, "/activities/date/2000-01-01.json")
+
+
+def test_conditional_headers(cache):
+    """Test validators are turned into conditional request headers."""
+    cache.set("k", {}, {"ETag": '"abc"', "Last-Modified": "Mon, 15 Jan 2024 00:00:00 GMT"})
+
+    assert ResponseCache.conditional_headers(cache.get("k")) == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Mon, 15 Jan 2024 00:00:00 GMT",
+    }
+    assert ResponseCache.conditional_headers({"etag": None, "last_modified": None}) == {}
+
+
+def test_set_not_found(cache):
+    """Test 404 markers are stored without response data."""
+    cache.set_not_found("k")
+
+    entry = cache.get("k")
+    assert entry["not_found"] is True
+    assert entry["data"] is None
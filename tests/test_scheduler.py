@@ -1,12 +1,15 @@
 """Tests for sync scheduler."""
 
+import threading
+from datetime import date, datetime
 from unittest.mock import patch
 
 import pytest
 from freezegun import freeze_time
 
+from src.config import Config
 from src.fitbit_collector import RateLimitError
-from src.scheduler import SyncScheduler
+from src.scheduler import SyncScheduler, _backoff_sleep, _is_quota_exhausted, _wait_for
 
 
 @pytest.fixture
@@ -70,6 +73,29 @@ def test_sync_data_success(scheduler, mock_collector, mock_writer, mock_state):
     mock_state.update_last_sync.assert_called_once_with("2024-01-14")
 
 
+def test_sync_data_skips_recently_synced_yesterday(
+    scheduler, mock_collector, mock_writer, mock_state
+):
+    """Test yesterday is fetched once per hour while today is fetched every cycle."""
+    mock_collector.get_daily_data.side_effect = lambda date: {"date": date.strftime("%Y-%m-%d")}
+
+    with freeze_time("2024-01-15 12:00:00") as frozen:
+        scheduler.sync_data()
+        frozen.tick(15 * 60)
+        scheduler.sync_data()
+        frozen.tick(60 * 60)
+        scheduler.sync_data()
+
+    fetched = [c.args[0].strftime("%Y-%m-%d") for c in mock_collector.get_daily_data.call_args_list]
+    assert fetched == [
+        "2024-01-14",
+        "2024-01-15",
+        "2024-01-15",
+        "2024-01-14",
+        "2024-01-15",
+    ]
+
+
 @freeze_time("2024-01-15 12:00:00")
 def test_sync_data_write_failure(scheduler, mock_collector, mock_writer, mock_state):
     """Test sync when writer fails."""
@@ -96,7 +122,7 @@ def test_sync_data_rate_limit_retry(scheduler, mock_collector, mock_writer, mock
         today_data,
     ]
 
-    with patch("time.sleep"):  # Don't actually sleep in tests
+    with patch.object(scheduler, "_sleep", return_value=False):  # Don't actually sleep in tests
         scheduler.sync_data()
 
     # Should have retried yesterday and then synced today
@@ -111,7 +137,7 @@ def test_sync_data_rate_limit_max_retries(scheduler, mock_collector):
     # Always raise rate limit
     mock_collector.get_daily_data.side_effect = RateLimitError("Rate limited", retry_after=1)
 
-    with patch("time.sleep"):
+    with patch.object(scheduler, "_sleep", return_value=False):
         scheduler.sync_data()
 
     # Should try 3 times for yesterday (initial + 2 retries) and 3 times for today
@@ -156,7 +182,7 @@ def test_backfill_from_last_synced(scheduler, mock_state, mock_collector, mock_w
         {"date": "2024-01-14", "steps": 4000},
     ]
 
-    with patch("time.sleep"):
+    with patch.object(scheduler, "_sleep", return_value=False):
         scheduler.backfill_data()
 
     # Should fetch 4 days of data
@@ -175,7 +201,7 @@ def test_backfill_from_config(scheduler, mock_state, mock_collector, mock_writer
         {"date": "2024-01-14", "steps": 2000},
     ]
 
-    with patch("time.sleep"):
+    with patch.object(scheduler, "_sleep", return_value=False):
         scheduler.backfill_data()
 
     # Should fetch 2 days of data (13th and 14th)
@@ -207,7 +233,7 @@ def test_backfill_handles_rate_limit(scheduler, mock_state, mock_collector, mock
         {"date": "2024-01-14", "steps": 2000},
     ]
 
-    with patch("time.sleep"):
+    with patch.object(scheduler, "_sleep", return_value=False):
         scheduler.backfill_data()
 
     # Should retry and complete (1 success + rate limit + retry + 1 more = 4 calls)
@@ -229,7 +255,7 @@ def test_backfill_stops_on_consecutive_rate_limits(
         RateLimitError("Rate limited", retry_after=1),
     ]
 
-    with patch("time.sleep"):
+    with patch.object(scheduler, "_sleep", return_value=False):
         scheduler.backfill_data()
 
     # Should stop after 3 consecutive failures
@@ -250,9 +276,301 @@ def test_backfill_saves_partial_progress_on_error(
         Exception("Network error"),
     ]
 
-    with patch("time.sleep"):
+    with patch.object(scheduler, "_sleep", return_value=False):
         scheduler.backfill_data()
 
     # Should have attempted to write before error
     # (May or may not be called depending on when error occurs)
     assert mock_collector.get_daily_data.call_count >= 2
+
+
+@freeze_time("2024-01-15 12:00:00")
+def test_backfill_paces_from_collector_quota(scheduler, mock_state, mock_collector, mock_writer):
+    """Test backfill waits the collector's quota-based delay between days."""
+    mock_state.get_last_successful_date.return_value = "2024-01-12"
+    mock_collector.get_daily_data.side_effect = [
+        {"date": "2024-01-13", "steps": 1000},
+        {"date": "2024-01-14", "steps": 2000},
+    ]
+    mock_collector.get_pacing_delay.return_value = 2.5
+
+    with patch.object(scheduler, "_sleep", return_value=False) as mock_sleep:
+        scheduler.backfill_data()
+
+    mock_sleep.assert_called_once_with(2.5)
+
+
+def test_intraday_backfill_paces_from_collector_quota(scheduler, mock_collector, mock_writer):
+    """Test intraday backfill waits the collector's quota-based delay instead of a fixed 30s."""
+    mock_collector.get_intraday_data.side_effect = lambda d: {"date": d}
+    mock_writer.write_intraday_data.return_value = True
+    mock_collector.get_pacing_delay.return_value = 2.5
+
+    with patch.object(scheduler, "_sleep", return_value=False) as mock_sleep:
+        scheduler._backfill_intraday_with_incremental_sync(
+            datetime(2024, 1, 13), datetime(2024, 1, 14)
+        )
+
+    mock_sleep.assert_called_once_with(2.5)
+
+
+def test_intraday_backfill_rate_limit_backs_off(scheduler, mock_collector, mock_writer):
+    """Test intraday rate limits use jittered exponential backoff before retrying."""
+    mock_collector.get_intraday_data.side_effect = [
+        RateLimitError("Rate limited", retry_after=10),
+        {"date": "2024-01-13"},
+    ]
+    mock_writer.write_intraday_data.return_value = True
+
+    with (
+        patch.object(scheduler, "_sleep", return_value=False) as mock_sleep,
+        patch("src.scheduler._backoff_sleep") as mock_backoff,
+    ):
+        scheduler._backfill_intraday_with_incremental_sync(
+            datetime(2024, 1, 13), datetime(2024, 1, 13)
+        )
+
+    mock_backoff.assert_called_once_with(1, 10, sleep=mock_sleep)
+    assert mock_collector.get_intraday_data.call_count == 2
+
+
+@pytest.mark.parametrize(
+    "attempt,retry_after,low,high",
+    [
+        (1, None, 1.0, 3.0),  # base * 2 = 2s, +/-50% jitter
+        (10, None, 15.0, 45.0),  # capped at 30s before jitter
+        (1, 60, 60.0, 60.0),  # Retry-After is a floor
+    ],
+)
+def test_backoff_sleep(attempt, retry_after, low, high):
+    """Test backoff grows exponentially, is capped, jittered and honours Retry-After."""
+    with patch("time.sleep") as mock_sleep:
+        delay = _backoff_sleep(attempt, retry_after)
+
+    assert low <= delay <= high
+    mock_sleep.assert_called_once_with(delay)
+
+
+@pytest.mark.parametrize(
+    "error, exhausted, wait",
+    [
+        (RateLimitError("Rate limited", 120, remaining=0), True, 120),
+        (RateLimitError("Rate limited", 0, remaining=5), False, 60),
+        (RateLimitError("Rate limited"), False, 60),
+    ],
+)
+def test_rate_limit_error_helpers(error, exhausted, wait):
+    """Test quota/wait helpers handle missing rate limit details."""
+    assert _is_quota_exhausted(error) is exhausted
+    assert _wait_for(error) == wait
+
+
+def test_sync_data_reuses_cached_device_info(scheduler, mock_state, mock_collector, mock_writer):
+    """Test cached device info is written without calling the Fitbit API."""
+    devices = [{"id": "123", "batteryLevel": 80}]
+    mock_state.get_cached_device_info.return_value = devices
+    mock_collector.get_daily_data.return_value = {"date": "2024-01-14", "steps": 1}
+
+    scheduler.sync_data()
+
+    mock_collector.get_device_info.assert_not_called()
+    mock_writer.write_device_info.assert_called_once_with(devices)
+
+
+def test_sync_data_fetches_and_caches_device_info(
+    scheduler, mock_state, mock_collector, mock_writer
+):
+    """Test device info is fetched and cached when the cache is empty or stale."""
+    devices = [{"id": "123", "batteryLevel": 80}]
+    mock_state.get_cached_device_info.return_value = None
+    mock_collector.get_device_info.return_value = devices
+    mock_collector.get_daily_data.return_value = {"date": "2024-01-14", "steps": 1}
+
+    scheduler.sync_data()
+
+    mock_state.update_device_info.assert_called_once_with(devices)
+    mock_writer.write_device_info.assert_called_once_with(devices)
+
+
+def test_scheduler_job_defaults(scheduler):
+    """Test jobs don't overlap themselves and coalesce missed runs."""
+    defaults = scheduler.scheduler._job_defaults
+
+    assert defaults["max_instances"] == 1
+    assert defaults["coalesce"] is True
+    assert defaults["misfire_grace_time"] == 300
+
+
+@freeze_time("2024-01-15 12:00:00")
+def test_backfill_writes_batches_in_background_in_order(
+    scheduler, mock_state, mock_collector, mock_writer
+):
+    """Test batch writes overlap the next fetch but state advances in order."""
+    mock_state.get_last_successful_date.return_value = "2024-01-02"
+    mock_collector.get_daily_data.side_effect = lambda date: {"date": date.strftime("%Y-%m-%d")}
+    write_started = threading.Event()
+    release_write = threading.Event()
+
+    def slow_write(batch):
+        write_started.set()
+        assert release_write.wait(timeout=5)
+        return len(batch), 0
+
+    mock_writer.write_multiple_days.side_effect = slow_write
+    fetched_during_write = []
+
+    def pacing_delay():
+        # Runs between fetches; record whether a write is still in flight
+        fetched_during_write.append(write_started.is_set() and not release_write.is_set())
+        if len(fetched_during_write) == 11:
+            release_write.set()
+        return 0
+
+    mock_collector.get_pacing_delay.side_effect = pacing_delay
+
+    with (
+        patch.object(scheduler, "_sleep", return_value=False),
+        patch("src.scheduler.BACKFILL_BATCH_MAX_DAYS", 10),
+    ):
+        scheduler._backfill_with_incremental_sync(date(2024, 1, 3), date(2024, 1, 14))
+
+    assert any(fetched_during_write)
+    assert [c.args[0] for c in mock_state.update_last_sync_memory.call_args_list] == [
+        "2024-01-12",
+        "2024-01-14",
+    ]
+    mock_state.flush.assert_called_once()
+
+
+@freeze_time("2024-01-15 12:00:00")
+def test_backfill_stops_on_shutdown_and_writes_batch(
+    scheduler, mock_state, mock_collector, mock_writer
+):
+    """Test a shutdown request ends the backfill and keeps the days already fetched."""
+    mock_collector.get_daily_data.side_effect = lambda date: {"date": date.strftime("%Y-%m-%d")}
+    mock_collector.get_pacing_delay.return_value = 300
+
+    def sleep(seconds):
+        scheduler._handle_shutdown(15, None)
+        return scheduler._stop_event.wait(seconds)
+
+    with patch.object(scheduler, "_sleep", side_effect=sleep):
+        scheduler._backfill_with_incremental_sync(date(2024, 1, 1), date(2024, 1, 14))
+
+    assert mock_collector.get_daily_data.call_count == 1
+    mock_writer.write_multiple_days.assert_called_once_with([{"date": "2024-01-01"}])
+    mock_state.update_last_sync.assert_called_once_with("2024-01-01")
+    mock_state.flush.assert_called_once()
+
+
+def test_sleep_wakes_on_shutdown(scheduler):
+    """Test waits return immediately once shutdown is requested."""
+    scheduler._handle_shutdown(15, None)
+
+    assert scheduler._sleep(300) is True
+
+
+def test_backfill_writes_batch_once_it_is_old(scheduler, mock_collector, mock_writer):
+    """Test slow, quota-paced backfills still write progress regularly."""
+    mock_collector.get_daily_data.side_effect = lambda date: {"date": date.strftime("%Y-%m-%d")}
+    clock = [1000.0]
+
+    def pacing_delay():
+        clock[0] += 400
+        return 0
+
+    mock_collector.get_pacing_delay.side_effect = pacing_delay
+
+    with (
+        patch.object(scheduler, "_sleep", return_value=False),
+        patch("src.scheduler.time.monotonic", lambda: clock[0]),
+    ):
+        scheduler._backfill_with_incremental_sync(date(2024, 1, 1), date(2024, 1, 5))
+
+    batches = [
+        [d["date"] for d in c.args[0]] for c in mock_writer.write_multiple_days.call_args_list
+    ]
+    # 400s per day: the third day takes each batch past 600s
+    assert batches == [["2024-01-01", "2024-01-02", "2024-01-03"], ["2024-01-04", "2024-01-05"]]
+
+
+@freeze_time("2024-01-15 12:00:00")
+def test_start_schedules_first_sync_after_delay(scheduler, mock_auth, mock_collector, mock_writer):
+    """Test the first sync is left to the scheduler instead of sleeping in start()."""
+    mock_auth.is_authorized.return_value = True
+    mock_writer.test_connection.return_value = True
+    mock_collector.seconds_since_last_request.return_value = 15
+
+    with (
+        patch.object(scheduler, "backfill_data"),
+        patch.object(scheduler, "sync_all") as mock_sync,
+        patch.object(scheduler, "_sleep") as mock_sleep,
+        patch.object(scheduler.scheduler, "start"),
+        patch("src.scheduler.Config.ENABLE_INTRADAY_COLLECTION", False),
+        patch("signal.signal"),
+        patch("atexit.register"),
+    ):
+        scheduler.start()
+
+    mock_sync.assert_not_called()
+    mock_sleep.assert_not_called()
+    job = scheduler.scheduler.get_job("sync_job")
+    # The 60s cooldown counts from the last Fitbit request, 15s ago
+    assert job.next_run_time.replace(tzinfo=None) == datetime(2024, 1, 15, 12, 0, 45)
+    assert job.misfire_grace_time == Config.SYNC_INTERVAL_MINUTES * 60
+
+
+@pytest.mark.parametrize("since,cooldown", [(10, 50), (60, 0), (float("inf"), 0)])
+def test_cooldown_counts_time_since_last_request(scheduler, mock_collector, since, cooldown):
+    """Test the post-backfill cooldown only waits out the remaining time."""
+    mock_collector.seconds_since_last_request.return_value = since
+
+    assert scheduler._cooldown_seconds() == cooldown
+
+
+def test_sync_all_runs_daily_then_intraday(scheduler):
+    """Test the combined job runs both syncs in order."""
+    calls = []
+
+    with (
+        patch.object(scheduler, "sync_data", side_effect=lambda: calls.append("daily")),
+        patch.object(scheduler, "sync_intraday_data", side_effect=lambda: calls.append("intraday")),
+    ):
+        scheduler.sync_all()
+
+    assert calls == ["daily", "intraday"]
+
+
+@freeze_time("2024-01-15 12:00:00")
+def test_backfill_uses_calendar_days(scheduler, mock_state, mock_collector, mock_writer):
+    """Test backfill fetches whole days and writes the last partial batch at yesterday."""
+    mock_state.get_last_successful_date.return_value = "2024-01-10"
+    mock_collector.get_daily_data.side_effect = lambda day: {"date": day.strftime("%Y-%m-%d")}
+    mock_collector.get_pacing_delay.return_value = 0
+
+    with patch.object(scheduler, "_sleep", return_value=False):
+        scheduler.backfill_data()
+
+    fetched = [c.args[0] for c in mock_collector.get_daily_data.call_args_list]
+    assert fetched == [datetime(2024, 1, day) for day in range(11, 15)]
+    mock_writer.write_multiple_days.assert_called_once()
+    assert len(mock_writer.write_multiple_days.call_args.args[0]) == 4
+
+
+@freeze_time("2024-01-15 12:00:00")
+def test_backfill_final_retry_after_quota_reset(scheduler, mock_state, mock_collector):
+    """Test the backfill waits for the quota reset once, then gives up if still limited."""
+    mock_collector.get_daily_data.side_effect = RateLimitError(
+        "Rate limited", 30, quota_reset=120, remaining=0
+    )
+
+    with (
+        patch.object(scheduler, "_sleep", return_value=False) as mock_sleep,
+        patch("src.scheduler._backoff_sleep") as mock_backoff,
+    ):
+        scheduler._backfill_with_incremental_sync(date(2024, 1, 1), date(2024, 1, 14))
+
+    # Two backoff retries, the quota reset wait, then one final attempt
+    assert mock_collector.get_daily_data.call_count == 4
+    assert mock_backoff.call_count == 2
+    mock_sleep.assert_called_once_with(120)
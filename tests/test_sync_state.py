@@ -2,7 +2,9 @@
 
 import json
 
-from src.sync_state import SyncState
+from freezegun import freeze_time
+
+from src.sync_state import FLUSH_INTERVAL_SECONDS, SyncState
 
 
 def test_sync_state_creation(temp_state_file):
@@ -57,3 +59,68 @@ def test_sync_state_invalid_json(temp_state_file):
     # Should handle gracefully and start fresh
     state = SyncState(temp_state_file)
     assert state.get_last_successful_date() is None
+
+
+def test_device_info_cache_persists_and_expires(temp_state_file):
+    """Test cached device info survives restarts and expires after max age."""
+    devices = [{"id": "123", "batteryLevel": 80}]
+    state = SyncState(temp_state_file)
+    state.update_device_info(devices)
+
+    reloaded = SyncState(temp_state_file)
+    assert reloaded.get_cached_device_info(3600) == devices
+
+    reloaded.device_info_updated -= 3600
+    assert reloaded.get_cached_device_info(3600) is None
+
+
+def test_device_info_cache_empty_by_default(temp_state_file):
+    """Test there is no cached device info before the first fetch."""
+    assert SyncState(temp_state_file).get_cached_device_info(3600) is None
+
+
+def test_sync_state_memory_update_is_debounced(temp_state_file):
+    """Test in-memory progress updates only hit disk once the interval elapses or on flush."""
+    with freeze_time("2025-12-24 12:00:00") as frozen:
+        state = SyncState(temp_state_file)
+
+        state.update_last_sync_memory("2025-12-20")
+        assert state.get_last_successful_date() == "2025-12-20"
+        assert not temp_state_file.exists()
+
+        frozen.tick(FLUSH_INTERVAL_SECONDS)
+        state.update_last_sync_memory("2025-12-21")
+        assert SyncState(temp_state_file).get_last_successful_date() == "2025-12-21"
+
+        state.update_last_sync_memory("2025-12-22")
+        assert SyncState(temp_state_file).get_last_successful_date() == "2025-12-21"
+
+        state.flush()
+        assert SyncState(temp_state_file).get_last_successful_date() == "2025-12-22"
+
+
+def test_intraday_backfill_memory_update_is_debounced(temp_state_file):
+    """Test intraday backfill progress is held in memory until flushed."""
+    with freeze_time("2025-12-24 12:00:00"):
+        state = SyncState(temp_state_file)
+
+        state.update_intraday_backfill_memory("2025-12-20")
+        assert state.get_last_intraday_backfill_date() == "2025-12-20"
+        assert not temp_state_file.exists()
+
+        state.flush()
+        assert SyncState(temp_state_file).get_last_intraday_backfill_date() == "2025-12-20"
+
+
+def test_sync_state_save_is_atomic(temp_state_file, monkeypatch):
+    """Test a failed save leaves the previous state file intact."""
+    state = SyncState(temp_state_file)
+    state.update_last_sync("2025-12-24")
+
+    def fail_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr("os.replace", fail_replace)
+    state.update_last_sync("2025-12-25")
+
+    assert SyncState(temp_state_file).get_last_successful_date() == "2025-12-24"
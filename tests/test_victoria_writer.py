@@ -1,5 +1,10 @@
 """Tests for Victoria Metrics writer."""
 
+import gzip
+import time
+from datetime import datetime
+from unittest.mock import patch
+
 import pytest
 import responses
 
@@ -8,9 +13,9 @@ from src.victoria_writer import VictoriaMetricsWriter
 
 
 @pytest.fixture
-def writer():
+def writer(tmp_path):
     """Create VictoriaMetricsWriter instance for testing."""
-    return VictoriaMetricsWriter()
+    return VictoriaMetricsWriter(pending_file=tmp_path / "pending_writes.prom")
 
 
 def test_format_metric_basic(writer):
@@ -86,6 +91,61 @@ def test_write_daily_data_converts_to_metrics(writer):
     assert data["heart_rate"]["resting"] == 62
 
 
+def test_daily_metrics_skips_empty_values(writer):
+    """Test unrecorded days and unused heart rate zones produce no lines."""
+    data = {
+        "date": "2025-12-24",
+        "timestamp": 1735084800,
+        "steps": 0,
+        "distance": 0.0,
+        "calories": 0,
+        "active_minutes": {},
+        "heart_rate": {
+            "resting": 0,
+            "zones": [
+                {"name": "Out of Range", "minutes": 0, "caloriesOut": 0.0},
+                {"name": "Fat Burn", "minutes": 15, "caloriesOut": 90.0},
+            ],
+        },
+    }
+
+    metrics = "".join(writer._daily_metrics(data))
+
+    assert "fitbit_steps_total" not in metrics
+    assert "fitbit_calories_total" not in metrics
+    assert 'zone="out_of_range"' not in metrics
+    assert 'zone="fat_burn"} 15 ' in metrics
+
+    # A recorded day with no steps still reports zero steps
+    metrics = "".join(writer._daily_metrics({**data, "calories": 1500}))
+    assert "fitbit_steps_total" in metrics
+
+
+def test_daily_metrics_zone_labels(writer):
+    """Test standard and custom heart rate zone names become snake_case labels."""
+    data = {
+        "date": "2025-12-24",
+        "timestamp": 1735084800,
+        "steps": 0,
+        "distance": 0.0,
+        "calories": 0,
+        "active_minutes": {},
+        "heart_rate": {
+            "resting": 0,
+            "zones": [
+                {"name": "Out of Range", "minutes": 600},
+                {"name": "Peak", "minutes": 5},
+                {"name": "Custom Zone", "minutes": 10},
+            ],
+        },
+    }
+
+    metrics = "".join(writer._daily_metrics(data))
+
+    for label in ("out_of_range", "peak", "custom_zone"):
+        assert f'zone="{label}"' in metrics
+
+
 def test_timestamp_conversion(writer):
     """Test timestamp format in metrics."""
     # Test with a single metric - timestamp gets multiplied by 1000 for milliseconds
@@ -95,6 +155,17 @@ def test_timestamp_conversion(writer):
     assert "1735084800000" in metric
 
 
+def test_format_metric_merges_extra_labels_in_order(writer):
+    """Test extra labels are sorted together with the base labels, also on reuse."""
+    for _ in range(2):
+        metric = writer._format_metric("fitbit_active_minutes", 30, 1735084800, {"type": "very"})
+
+        assert metric == (
+            f'fitbit_active_minutes{{device="charge6",type="very",user="{writer.user_id}"}} '
+            "30 1735084800000\n"
+        )
+
+
 @responses.activate
 def test_write_daily_data_success(writer):
     """Test successful write to Victoria Metrics."""
@@ -208,6 +279,8 @@ def test_write_device_info_with_battery_level(writer):
     assert b"85" in request_body  # Exact percentage
     assert b'device_id="12345"' in request_body
     assert b'device_type="Charge 6"' in request_body
+    # "Z" suffix is parsed as UTC: 2024-01-15T10:30:00Z
+    assert b"1705314600 " in request_body
 
 
 @responses.activate
@@ -236,3 +309,188 @@ def test_write_device_info_fallback_to_text_battery(writer):
     assert b"fitbit_device_battery_percent" in request_body
     assert b"50" in request_body  # "Medium" maps to 50%
     assert b'device_id="67890"' in request_body
+
+
+@responses.activate
+def test_send_metrics_reuses_session(writer):
+    """Test consecutive writes share one authenticated session."""
+    responses.add(responses.POST, writer.endpoint, status=204)
+    session = writer._session
+
+    assert writer._send_metrics(["metric 1 1000\n"]) is True
+    assert writer._send_metrics(["metric 2 2000\n"]) is True
+
+    assert writer._session is session
+    assert len(responses.calls) == 2
+    assert all("Authorization" in call.request.headers for call in responses.calls)
+
+
+def _day(date: str, steps: int) -> dict:
+    return {
+        "date": date,
+        "timestamp": 1735084800,
+        "steps": steps,
+        "distance": 1.0,
+        "calories": 2000,
+        "active_minutes": {},
+        "heart_rate": {"resting": None, "zones": []},
+    }
+
+
+@responses.activate
+def test_write_multiple_days_combines_requests(writer):
+    """Test several days are sent in one request while under the point budget."""
+    responses.add(responses.POST, writer.endpoint, status=204)
+
+    result = writer.write_multiple_days([_day("2024-12-24", 1), _day("2024-12-25", 2), {}])
+
+    assert result == (2, 1)  # The malformed day is counted as failed
+    assert len(responses.calls) == 1
+    assert responses.calls[0].request.body.count(b"fitbit_steps_total") == 2
+
+
+@responses.activate
+def test_write_multiple_days_splits_at_point_budget(writer):
+    """Test a new request starts once a chunk reaches VM_BATCH_POINTS lines."""
+    responses.add(responses.POST, writer.endpoint, status=500)
+    responses.add(responses.POST, writer.endpoint, status=204)
+
+    with patch("src.victoria_writer.Config.VM_BATCH_POINTS", 6):
+        result = writer.write_multiple_days(
+            [_day("2024-12-24", 1), _day("2024-12-25", 2), _day("2024-12-26", 3)]
+        )
+
+    # 3 lines per day: first request holds two days and fails, second holds one,
+    # after which the buffered first chunk is replayed
+    assert result == (1, 2)
+    assert len(responses.calls) == 3
+    assert responses.calls[2].request.body == responses.calls[0].request.body
+
+
+@responses.activate
+def test_send_metrics_buffers_while_circuit_open_and_replays(tmp_path):
+    """Test metrics are buffered once Victoria Metrics keeps failing, then replayed."""
+    writer = VictoriaMetricsWriter(pending_file=tmp_path / "pending.prom")
+    responses.add(responses.POST, writer.endpoint, status=500)
+
+    for i in range(3):
+        assert writer._send_metrics([f"metric {i} 1000\n"]) is False
+    assert len(responses.calls) == 3
+
+    # Failed writes are kept on disk rather than lost
+    assert writer.pending_file.read_text() == "metric 0 1000\nmetric 1 1000\nmetric 2 1000\n"
+
+    # Circuit is open: no request is made and the metrics go to disk
+    assert writer._send_metrics(["metric 3 1000\n"]) is False
+    assert len(responses.calls) == 3
+    assert writer.pending_file.read_text().endswith("metric 2 1000\nmetric 3 1000\n")
+
+    # Once the probe succeeds the buffered metrics are sent as well
+    writer._breaker.reset_timeout = 0
+    responses.replace(responses.POST, writer.endpoint, status=204)
+    assert writer._send_metrics(["metric 4 1000\n"]) is True
+
+    assert responses.calls[-1].request.body == b"".join(
+        f"metric {i} 1000\n".encode() for i in range(4)
+    )
+    assert not writer.pending_file.exists()
+
+
+def test_buffer_pending_drops_oldest_beyond_size_cap(writer):
+    """Test the pending writes file keeps only the newest metrics once over its cap."""
+    line = "x" * 1023 + "\n"  # 1 KiB per metric line
+
+    with patch("src.victoria_writer.Config.VM_PENDING_MAX_MB", 1):
+        for i in range(1030):
+            writer._buffer_pending(f"{i:04d}" + line[4:])
+
+    data = writer.pending_file.read_text()
+    assert len(data) <= 1024 * 1024
+    kept = [int(metric[:4]) for metric in data.splitlines()]
+    assert kept[0] > 0
+    assert kept == list(range(kept[0], 1030))
+
+
+@responses.activate
+def test_send_metrics_client_error_does_not_open_circuit(writer):
+    """Test rejected payloads (4xx) are not treated as an outage."""
+    responses.add(responses.POST, writer.endpoint, status=400)
+
+    for _ in range(3):
+        assert writer._send_metrics(["bad line\n"]) is False
+
+    assert writer._breaker.state == "closed"
+    assert not writer.pending_file.exists()
+
+
+@responses.activate
+def test_send_metrics_retries_gateway_errors(writer):
+    """Test a transient 503 is retried by the session adapter."""
+    responses.add(responses.POST, writer.endpoint, status=503)
+    responses.add(responses.POST, writer.endpoint, status=204)
+
+    assert writer._send_metrics(["metric 1 1000\n"]) is True
+    assert len(responses.calls) == 2
+    assert responses.calls[-1].request.headers["Content-Type"] == "text/plain"
+
+
+@responses.activate
+def test_send_metrics_gzips_large_payloads(writer):
+    """Test multi-day payloads are gzip-compressed and small ones sent as-is."""
+    responses.add(responses.POST, writer.endpoint, status=204)
+    metrics = [f'fitbit_steps_total{{user="default"}} {i} 1000\n' for i in range(100)]
+
+    assert writer._send_metrics(metrics) is True
+    assert writer._send_metrics(metrics[:1]) is True
+
+    large, small = (call.request for call in responses.calls)
+    assert large.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(large.body).decode() == "".join(metrics)
+    assert "Content-Encoding" not in small.headers
+    assert small.body == metrics[0].encode()
+    # Bodies are sent as bytes with fixed-length framing, never chunked
+    for request in (large, small):
+        assert request.headers["Content-Length"] == str(len(request.body))
+        assert "Transfer-Encoding" not in request.headers
+
+
+@responses.activate
+def test_send_metrics_compression_can_be_disabled(writer):
+    """Test large payloads are sent uncompressed when VM_COMPRESS_REQUESTS is off."""
+    responses.add(responses.POST, writer.endpoint, status=204)
+    metrics = [f'fitbit_steps_total{{user="default"}} {i} 1000\n' for i in range(100)]
+
+    with patch("src.victoria_writer.Config.VM_COMPRESS_REQUESTS", False):
+        assert writer._send_metrics(metrics) is True
+
+    request = responses.calls[0].request
+    assert "Content-Encoding" not in request.headers
+    assert request.body == "".join(metrics).encode()
+
+
+def test_write_intraday_data_timestamps_across_dst(writer, monkeypatch):
+    """Test intraday timestamps match local time conversion on a DST change day."""
+    monkeypatch.setenv("TZ", "Europe/Stockholm")
+    time.tzset()
+    sent = []
+    monkeypatch.setattr(writer, "_send_metrics", lambda metrics: sent.extend(metrics) or True)
+    times = ["01:59:30", "03:00:00", "03:30:15", "23:59:59"]
+    data = {
+        "date": "2024-03-31",
+        "resources": {"steps": {"dataset": [{"time": t, "value": 1} for t in times]}},
+    }
+
+    try:
+        assert writer.write_intraday_data(data) is True
+        expected = [
+            int(datetime.fromisoformat(f"2024-03-31T{t}").timestamp()) * 1000 for t in times
+        ]
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+    assert [int(line.split()[-1]) for line in sent] == expected
+    # Lines built from the per-resource prefix match the general formatter
+    assert sent == [
+        writer._format_metric("fitbit_steps_intraday", 1, ts // 1000) for ts in expected
+    ]